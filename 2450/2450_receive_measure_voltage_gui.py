@@ -4,13 +4,22 @@ from a Keithley 2450 when a digital trigger is detected.
 
 from __future__ import annotations
 
+import concurrent.futures
+import functools
+import gc
 import pathlib
+import queue
+import re
+import string
 import threading
+from collections import deque
+from collections.abc import Iterator
 import tkinter as tk
 from tkinter import messagebox, scrolledtext, ttk
 
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import numpy as np
 import pyvisa
 from pyvisa import constants as visa_constants
 
@@ -37,7 +46,57 @@ LINE_MODE_CHOICES = (
 )
 LINE_MODE_LABELS = tuple(label for label, _ in LINE_MODE_CHOICES)
 LINE_MODE_LOOKUP = {label: key for label, key in LINE_MODE_CHOICES}
+EDGE_SET = frozenset(EDGE_OPTIONS)
+MODE_KEYS = frozenset(key for _, key in LINE_MODE_CHOICES)
+IO_TIMEOUT_MS = 20000
 DRAIN_TIMEOUT_MS = 750
+# The default entry texts are known-good, so _format_float_arg passes them through.
+_DEFAULT_CACHE = frozenset((DEFAULT_RANGE, DEFAULT_NPLC))
+# Scripts that provide wait_for_trigger_measure_framed() answer with exactly two
+# lines (joined progress, then result); set False to drain until a read timeout.
+FRAMED_RESULTS = True
+PROGRESS_SEPARATOR = ";"
+CMD_TEMPLATE = string.Template(
+    "wait_for_trigger_measure_framed($count, $interval, $rng, $nplc, $tmo, $edge, $line, '$mode')"
+)
+LEGACY_CMD_TEMPLATE = string.Template(
+    "print(wait_for_trigger_measure($count, $interval, $rng, $nplc, $tmo, $edge, $line, '$mode'))"
+)
+# Fetch defbuffer1 as little-endian REAL32 instead of ASCII CSV. format.data is
+# switched only around printbuffer so print() of status values stays ASCII.
+BINARY_BUFFER = True
+BINARY_BUFFER_COMMAND = (
+    "format.data = format.REAL32 "
+    "printbuffer(1, defbuffer1.n, defbuffer1.readings) "
+    "format.data = format.ASCII"
+)
+SCRIPT_CHUNK_SIZE = 32 * 1024
+LOG_MAX_LINES = 2000
+PROGRESS_POLL_MS = 50
+PROGRESS_BATCH = 200
+MAX_ERRORS_SHOWN = 10
+PLOT_REDRAW_MS = 33
+PLOT_MAX_POINTS = 2000
+GC_EVERY_PLOTS = 100
+ERROR_ENTRY_RE = re.compile(r'-?\d+,"[^"]*"')
+
+
+_RM_SINGLETON: pyvisa.ResourceManager | None = None
+_RM_LOCK = threading.Lock()
+
+
+def _get_rm() -> pyvisa.ResourceManager:
+    """Return the process-wide ResourceManager, creating it on first use."""
+    global _RM_SINGLETON
+    with _RM_LOCK:
+        if _RM_SINGLETON is None:
+            _RM_SINGLETON = pyvisa.ResourceManager()
+        return _RM_SINGLETON
+
+
+@functools.lru_cache(maxsize=None)
+def _lookup_mode(label: str) -> str | None:
+    return LINE_MODE_LOOKUP.get(label)
 
 
 class TriggerMeasureGUI:
@@ -51,6 +110,10 @@ class TriggerMeasureGUI:
         self.rm: pyvisa.ResourceManager | None = None
         self.inst: pyvisa.resources.MessageBasedResource | None = None
         self.script_loaded = False
+        self.script_loading = False
+        self._script_text: str | None = None
+        # Guards only the swap of self.inst; never held across instrument I/O.
+        self._inst_lock = threading.Lock()
 
         self.address_var = tk.StringVar(value=DEFAULT_ADDRESS)
         self.samples_var = tk.StringVar(value=DEFAULT_SAMPLES)
@@ -65,19 +128,33 @@ class TriggerMeasureGUI:
         self.figure = None
         self.ax = None
         self.canvas = None
+        self._line = None
+        self._fill = None
+        self._plot_dirty = False
+        self._plot_count = 0
+        self._draw_scheduled = False
 
         self.log_text: scrolledtext.ScrolledText | None = None
+        self._log_queue: deque[str] = deque()
+        self._log_flush_pending = False
         self.status_var = tk.StringVar(value="Disconnected")
+        self._status_text = "Disconnected"
+        self._btn_state_cache: tuple[bool, bool, bool] | None = None
         self.btn_clear: ttk.Button | None = None
         self.btn_errors: ttk.Button | None = None
 
-        self.worker: threading.Thread | None = None
+        # One persistent worker serializes script uploads and measurements on the VISA session.
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="visa-worker")
+        self._future: concurrent.futures.Future[None] | None = None
+        self._srq_supported: bool | None = None
+        self._progress_q: queue.Queue[str] = queue.Queue()
         self.running = False
         self.cancel_requested = False
         self.current_context: dict[str, str] | None = None
 
         self._build_ui()
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(PROGRESS_POLL_MS, self._drain_progress)
 
     # ------------------------------------------------------------------ UI --
     def _build_ui(self) -> None:
@@ -171,6 +248,8 @@ class TriggerMeasureGUI:
         self.ax.set_xlabel("Sample")
         self.ax.set_ylabel("Voltage (V)")
         self.ax.grid(True, linestyle="--", alpha=0.6)
+        self.ax.set_title("Triggered capture")
+        (self._line,) = self.ax.plot([], [], marker="o", markersize=4, linewidth=1.5, color="tab:blue")
         self.canvas = FigureCanvasTkAgg(self.figure, master=plot_frame)
         self.canvas.get_tk_widget().grid(column=0, row=0, sticky="nsew")
 
@@ -181,17 +260,16 @@ class TriggerMeasureGUI:
             messagebox.showerror("Connect", "Provide a VISA address.")
             return
         try:
-            if self.rm is None:
-                self.rm = pyvisa.ResourceManager()
+            self.rm = _get_rm()
             self.inst = self.rm.open_resource(address)
             self.inst.read_termination = "\n"
             self.inst.write_termination = "\n"
-            self.inst.timeout = 20000
+            self.inst.timeout = IO_TIMEOUT_MS
+            self._srq_supported = None
             idn = self.inst.query("*IDN?").strip()
             self._log(f"Connected: {idn}")
-            self.status_var.set(f"Connected to {idn}")
-            self._load_script()
-            self._update_button_state()
+            self._set_status(f"Connected to {idn}")
+            self._start_script_load()
         except pyvisa.VisaIOError as exc:
             messagebox.showerror("Connect", f"Connection failed: {exc}")
             self._log(f"Connection failed: {exc}")
@@ -201,48 +279,95 @@ class TriggerMeasureGUI:
     def disconnect(self) -> None:
         if self.running:
             self.cancel_measurement()
-        if self.inst is not None:
-            try:
-                self.inst.close()
-            except pyvisa.VisaIOError:
-                pass
-        if self.rm is not None:
+        # Detach the session first, then close it without waiting for an upload in
+        # flight; the worker sees the swap and reports the load as disconnected.
+        with self._inst_lock:
+            inst, self.inst = self.inst, None
+        if inst is not None:
             try:
-                self.rm.close()
+                inst.close()
             except pyvisa.VisaIOError:
                 pass
-        self.rm = None
-        self.inst = None
+        # The shared ResourceManager stays open so reconnects skip VISA library init.
         self.script_loaded = False
-        self.status_var.set("Disconnected")
+        self._set_status("Disconnected")
         self._log("Disconnected.")
         self._update_button_state()
 
     # ---------------------------------------------------------------- script --
-    def _load_script(self) -> None:
-        if self.inst is None:
+    def _start_script_load(self) -> None:
+        if self.script_loading:
             return
-        if not TSP_FILE.exists():
-            messagebox.showerror("Script", f"Missing TSP file: {TSP_FILE}")
+        self.script_loading = True
+        self.script_loaded = False
+        self._set_status("Loading script...")
+        self._update_button_state()
+        self._executor.submit(self._load_script_worker)
+
+    def _load_script_worker(self) -> None:
+        with self._inst_lock:
+            inst = self.inst
+        if inst is None:
+            ok, message = False, "Instrument disconnected."
+        else:
+            try:
+                ok, message = self._load_script(inst)
+            except Exception:  # noqa: BLE001 - a closed session can raise beyond VisaIOError
+                ok, message = False, "Instrument disconnected."
+            with self._inst_lock:
+                if self.inst is not inst:
+                    # disconnect() closed the session under the upload.
+                    ok, message = False, "Instrument disconnected."
+        try:
+            self.root.after(0, self._finish_script_load, inst, ok, message)
+        except (RuntimeError, tk.TclError):
+            pass
+
+    def _finish_script_load(
+        self, inst: pyvisa.resources.MessageBasedResource | None, ok: bool, message: str
+    ) -> None:
+        self.script_loading = False
+        if self.inst is not None and inst is not self.inst:
+            # Reconnected while the old upload was unwinding; load onto the new session.
+            self._start_script_load()
             return
-        script_text = TSP_FILE.read_text(encoding="utf-8")
+        self.script_loaded = ok and self.inst is not None
+        self._log(message)
+        if self.inst is not None:
+            if ok:
+                self._set_status("Script loaded")
+            else:
+                self._set_status("Script load failed")
+                messagebox.showerror("Script", message)
+        self._update_button_state()
+
+    def _load_script(self, inst: pyvisa.resources.MessageBasedResource) -> tuple[bool, str]:
+        """Upload the TSP script. Runs on the worker thread, so no Tk calls here."""
+        if self._script_text is None:
+            if not TSP_FILE.exists():
+                return False, f"Missing TSP file: {TSP_FILE}"
+            self._script_text = TSP_FILE.read_text(encoding="utf-8")
+        script_text = self._script_text
+        # Send the body as raw chunks instead of one VISA write per line.
+        payload = script_text if script_text.endswith("\n") else script_text + "\n"
         try:
-            self.inst.write(f"pcall(script.delete, '{SCRIPT_NAME}')")
+            inst.write(f"pcall(script.delete, '{SCRIPT_NAME}')")
         except pyvisa.VisaIOError:
             pass
         try:
-            self.inst.write(f"loadscript {SCRIPT_NAME}")
-            for line in script_text.splitlines():
-                self.inst.write(line)
-            self.inst.write("endscript")
-            self.inst.write(f"{SCRIPT_NAME}.save()")
-            self.inst.write(f"{SCRIPT_NAME}()")
-            self.script_loaded = True
-            self._log("TSP script loaded.")
+            inst.write(f"loadscript {SCRIPT_NAME}")
+            for start in range(0, len(payload), SCRIPT_CHUNK_SIZE):
+                chunk = payload[start : start + SCRIPT_CHUNK_SIZE]
+                inst.write_raw(chunk.encode("utf-8"))
+            inst.write("endscript")
+            inst.write(f"{SCRIPT_NAME}.save()")
+            inst.write(f"{SCRIPT_NAME}()")
+            inst.write("format.byteorder = format.LITTLEENDIAN")
+            # Raise SRQ as soon as output is queued so the worker can block on the event.
+            inst.write("status.request_enable = status.MAV")
         except pyvisa.VisaIOError as exc:
-            messagebox.showerror("Script", f"Failed to load script: {exc}")
-            self._log(f"Script load failed: {exc}")
-            self.script_loaded = False
+            return False, f"Script load failed: {exc}"
+        return True, "TSP script loaded."
 
     # ------------------------------------------------------------- measure --
     def start_measurement(self) -> None:
@@ -260,17 +385,23 @@ class TriggerMeasureGUI:
             timeout_arg = self._format_float_arg(self.timeout_var.get(), allow_nil=True)
             line = self._parse_int(self.line_var.get(), minimum=1, maximum=6)
             mode_key, mode_label = self._resolve_mode()
+            edge = self.edge_var.get()
+            if edge and edge not in EDGE_SET:
+                raise ValueError("Select a valid trigger edge.")
         except ValueError as exc:
             messagebox.showerror("Measure", str(exc))
             return
 
-        edge = self.edge_var.get().strip().lower()
-        edge_arg = f"'{edge}'" if edge else "nil"
-        command = (
-            "print(wait_for_trigger_measure("
-            f"{count}, {interval}, {range_arg}, {nplc_arg}, {timeout_arg}, "
-            f"{edge_arg}, {line}, '{mode_key}'"
-            "))"
+        template = CMD_TEMPLATE if FRAMED_RESULTS else LEGACY_CMD_TEMPLATE
+        command = template.substitute(
+            count=count,
+            interval=interval,
+            rng=range_arg,
+            nplc=nplc_arg,
+            tmo=timeout_arg,
+            edge=f"'{edge}'" if edge else "nil",
+            line=line,
+            mode=mode_key,
         )
 
         self.running = True
@@ -282,7 +413,7 @@ class TriggerMeasureGUI:
             "samples": str(count),
             "interval": f"{interval}",
         }
-        self.status_var.set("Waiting for trigger...")
+        self._set_status("Waiting for trigger...")
         self._log(
             "Waiting for trigger on {line} ({mode}, edge={edge}). Target: {samples} sample(s) @ interval {interval}s.".format(
                 **self.current_context
@@ -290,8 +421,9 @@ class TriggerMeasureGUI:
         )
         self._update_button_state()
 
-        self.worker = threading.Thread(target=self._measurement_worker, args=(command,), daemon=True)
-        self.worker.start()
+        wait_ms = None if timeout_arg == "nil" else int(float(timeout_arg) * 1000)
+        self._future = self._executor.submit(self._measurement_worker, command, wait_ms)
+        self._future.add_done_callback(lambda f: self.root.after(0, self._handle_future, f))
 
     def cancel_measurement(self) -> None:
         if not self.running or self.inst is None:
@@ -307,22 +439,25 @@ class TriggerMeasureGUI:
             pass
         self._log("Cancel requested.")
 
-    def _measurement_worker(self, command: str) -> None:
+    def _measurement_worker(self, command: str, wait_ms: int | None = None) -> None:
         inst = self.inst
         if inst is None:
             self._async_complete(error="Instrument disconnected.")
             return
+        # Every line but the last is progress; hold one line back until the next arrives.
+        result_line: str | None = None
         try:
-            lines = self._query_lines(command)
+            for line in self._query_lines(command, framed=FRAMED_RESULTS, wait_ms=wait_ms):
+                if result_line is not None:
+                    self._progress_q.put(result_line)
+                result_line = line
         except Exception as exc:  # pragma: no cover - GUI only
             self._async_complete(error=str(exc))
             return
 
-        result_line = lines[-1] if lines else None
-        progress_lines = lines[:-1] if len(lines) > 1 else []
         status = None
         captured = 0
-        voltages: list[float] | None = None
+        voltages: np.ndarray | None = None
         buffer_error: str | None = None
 
         if result_line is None:
@@ -340,69 +475,82 @@ class TriggerMeasureGUI:
 
         if status == "COMPLETE" and captured > 0:
             try:
-                buffer_lines = self._query_lines("printbuffer(1, defbuffer1.n, defbuffer1)")
-                buffer_text = "\n".join(buffer_lines)
-                voltages = self._parse_buffer(buffer_text)
+                if BINARY_BUFFER:
+                    voltages = self._query_buffer_binary()
+                else:
+                    # printbuffer answers on a single line, so no drain is needed.
+                    buffer_text = self.inst.query("printbuffer(1, defbuffer1.n, defbuffer1)")
+                    voltages = self._parse_buffer(buffer_text)
             except Exception as exc:  # pragma: no cover - GUI only
                 buffer_error = str(exc)
 
         self._async_complete(
             success=status,
             captured=captured,
-            progress=progress_lines,
             voltages=voltages,
             buffer_error=buffer_error,
         )
 
+    def _handle_future(self, future: concurrent.futures.Future[None]) -> None:
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            self._async_complete(error=str(exc))
+
     def _async_complete(
         self,
         success: str | None = None,
         captured: int = 0,
-        progress: list[str] | None = None,
-        voltages: list[float] | None = None,
+        voltages: np.ndarray | None = None,
         buffer_error: str | None = None,
         error: str | None = None,
     ) -> None:
         def finish() -> None:
             self.running = False
-            self.worker = None
+            self._future = None
             self._update_button_state()
-
-            if progress:
-                for line in progress:
-                    self._log(line)
+            self._flush_progress()
 
             if error:
                 self._log(f"Measurement failed: {error}")
                 messagebox.showerror("Measure", error)
-                self.status_var.set("Measurement failed")
+                self._set_status("Measurement failed")
                 return
 
             if success == "TIMEOUT":
                 self._log("No trigger detected before timeout.")
-                self.status_var.set("Timeout waiting for trigger")
+                self._set_status("Timeout waiting for trigger")
                 return
             if success == "INVALID_MODE":
                 self._log("Selected DIGIO line mode is not a trigger input.")
-                self.status_var.set("Invalid mode for trigger input")
+                self._set_status("Invalid mode for trigger input")
                 return
             if success == "CANCEL":
                 self._log("Measurement cancelled.")
-                self.status_var.set("Cancelled")
+                self._set_status("Cancelled")
                 return
             if success not in {"COMPLETE", "NO_RESULT"}:
                 self._log(f"Instrument returned: {success}")
-                self.status_var.set(success or "Unknown result")
+                self._set_status(success or "Unknown result")
                 return
 
             self._log(f"Captured {captured} sample(s).")
-            self.status_var.set("Measurement complete")
+            self._set_status("Measurement complete")
             if buffer_error:
                 self._log(f"Buffer read failed: {buffer_error}")
             elif voltages is not None:
-                if voltages:
+                if voltages.size:
                     self._log("Voltages (V):")
-                    self._log(", ".join(f"{v:.6f}" for v in voltages))
+                    self._log(
+                        np.array2string(
+                            voltages,
+                            formatter={"float_kind": lambda x: format(x, ".6f")},
+                            separator=", ",
+                            threshold=50,
+                            max_line_width=120,
+                        )
+                    )
                 else:
                     self._log("Buffer empty.")
                 self._update_plot(voltages)
@@ -424,36 +572,79 @@ class TriggerMeasureGUI:
             messagebox.showwarning("Errors", "Instrument not connected.")
             return
         try:
-            errors: list[str] = []
-            for _ in range(10):
-                err = self.inst.query("SYST:ERR?").strip()
-                errors.append(err)
-                if err.startswith("0,"):
-                    break
+            try:
+                raw = self.inst.query("SYST:ERR:ALL?").strip()
+                errors = ERROR_ENTRY_RE.findall(raw) or [raw]
+            except pyvisa.VisaIOError:
+                # Firmware without SYST:ERR:ALL? still answers the one-at-a-time query.
+                errors = []
+                for _ in range(10):
+                    err = self.inst.query("SYST:ERR?").strip()
+                    errors.append(err)
+                    if err.startswith("0,"):
+                        break
+            if len(errors) > MAX_ERRORS_SHOWN:
+                errors = errors[-MAX_ERRORS_SHOWN:]
             self._log("Errors: " + " | ".join(errors))
         except pyvisa.VisaIOError as exc:
             messagebox.showerror("Errors", f"Failed to read errors: {exc}")
 
     # ----------------------------------------------------------------- utils --
     def _log(self, message: str) -> None:
+        self._log_queue.append(message)
+        if not self._log_flush_pending:
+            self._log_flush_pending = True
+            self.root.after_idle(self._flush_log)
+
+    def _flush_log(self) -> None:
+        self._log_flush_pending = False
+        if not self._log_queue:
+            return
+        batch = "\n".join(self._log_queue)
+        self._log_queue.clear()
         if not self.log_text:
             return
         self.log_text.configure(state=tk.NORMAL)
-        self.log_text.insert(tk.END, message + "\n")
+        self.log_text.insert(tk.END, batch + "\n")
+        lines = int(self.log_text.index("end-1c").split(".")[0]) - 1
+        if lines > LOG_MAX_LINES:
+            self.log_text.delete("1.0", f"{lines - LOG_MAX_LINES + 1}.0")
         self.log_text.see(tk.END)
         self.log_text.configure(state=tk.DISABLED)
 
+    def _drain_progress(self) -> None:
+        self._flush_progress(PROGRESS_BATCH)
+        self.root.after(PROGRESS_POLL_MS, self._drain_progress)
+
+    def _flush_progress(self, limit: int | None = None) -> None:
+        items: list[str] = []
+        while limit is None or len(items) < limit:
+            try:
+                items.append(self._progress_q.get_nowait())
+            except queue.Empty:
+                break
+        if items:
+            self._log("\n".join(items))
+
     def _check_ready(self) -> bool:
         if self.inst is None:
             messagebox.showwarning("Instrument", "Connect to the instrument first.")
             return False
+        if self.script_loading:
+            messagebox.showinfo("Instrument", "Script upload in progress.")
+            return False
         if not self.script_loaded:
-            self._load_script()
-        return self.script_loaded
+            self._start_script_load()
+            return False
+        return True
 
     def _update_button_state(self) -> None:
         connected = self.inst is not None
-        can_run = connected and not self.running
+        state = (connected, self.running, self.script_loading)
+        if state == self._btn_state_cache:
+            return
+        self._btn_state_cache = state
+        can_run = connected and not self.running and not self.script_loading
         self.btn_start.configure(state="normal" if can_run else "disabled")
         self.btn_cancel.configure(state="normal" if connected and self.running else "disabled")
         if self.btn_clear is not None:
@@ -461,6 +652,11 @@ class TriggerMeasureGUI:
         if self.btn_errors is not None:
             self.btn_errors.configure(state="normal" if can_run else "disabled")
 
+    def _set_status(self, text: str) -> None:
+        if text != self._status_text:
+            self._status_text = text
+            self.status_var.set(text)
+
     def _parse_int(self, value: str, *, minimum: int | None = None, maximum: int | None = None) -> int:
         try:
             ivalue = int(float(value.strip()))
@@ -495,6 +691,8 @@ class TriggerMeasureGUI:
             if default is not None:
                 return default
             raise ValueError("Enter a numeric value.")
+        if text in _DEFAULT_CACHE:
+            return text
         try:
             float(text)
         except ValueError as exc:
@@ -503,27 +701,45 @@ class TriggerMeasureGUI:
 
     def _resolve_mode(self) -> tuple[str, str]:
         label = self.mode_var.get()
-        key = LINE_MODE_LOOKUP.get(label)
-        if not key:
+        key = _lookup_mode(label)
+        if key not in MODE_KEYS:
             raise ValueError("Select a valid line mode.")
         return key, label
 
-    def _query_lines(self, command: str) -> list[str]:
+    def _query_lines(
+        self,
+        command: str,
+        *,
+        framed: bool = False,
+        wait_ms: int | None = None,
+    ) -> Iterator[str]:
         inst = self.inst
         if inst is None:
             raise RuntimeError("Instrument not connected.")
+        srq = framed and self._enable_srq(inst)
         inst.write(command)
-        lines: list[str] = []
-        original_timeout = inst.timeout
-        try:
-            first = inst.read().strip()
-            if first:
-                lines.append(first)
-        except pyvisa.VisaIOError as exc:
-            inst.timeout = original_timeout
-            raise exc
+        if srq:
+            self._wait_for_srq(inst, wait_ms)
+        if framed:
+            # Without SRQ the first read blocks for the whole trigger wait, so its
+            # timeout must cover the user's trigger timeout as well.
+            if wait_ms is not None and not srq:
+                inst.timeout = wait_ms + IO_TIMEOUT_MS
+            try:
+                progress = inst.read().strip()
+            finally:
+                inst.timeout = IO_TIMEOUT_MS
+            if progress:
+                yield from progress.split(PROGRESS_SEPARATOR)
+            yield inst.read().strip()
+            return
+        # Legacy scripts give no line count, so this path alone still shortens the
+        # timeout to detect the end of output.
+        first = inst.read().strip()
+        if first:
+            yield first
         try:
-            inst.timeout = min(original_timeout, DRAIN_TIMEOUT_MS)
+            inst.timeout = DRAIN_TIMEOUT_MS
             while True:
                 try:
                     extra = inst.read().strip()
@@ -532,45 +748,106 @@ class TriggerMeasureGUI:
                         break
                     raise
                 if extra:
-                    lines.append(extra)
+                    yield extra
         finally:
-            inst.timeout = original_timeout
-        return lines
+            inst.timeout = IO_TIMEOUT_MS
 
-    def _parse_buffer(self, text: str) -> list[float]:
-        if not text:
-            return []
-        values: list[float] = []
-        for token in text.replace("\n", ",").split(","):
-            token = token.strip()
-            if not token:
-                continue
+    def _query_buffer_binary(self) -> np.ndarray:
+        inst = self.inst
+        if inst is None:
+            raise RuntimeError("Instrument not connected.")
+        # printbuffer sends an indefinite (#0) block and this session ends reads at
+        # "\n", so without a point count the read stops at the first 0x0A byte in
+        # the float data and leaves the rest queued.
+        points = int(float(inst.query("print(defbuffer1.n)")))
+        if points <= 0:
+            return np.empty(0, dtype=np.float32)
+        values = inst.query_binary_values(
+            BINARY_BUFFER_COMMAND,
+            datatype="f",
+            is_big_endian=False,
+            container=np.ndarray,
+            data_points=points,
+            expect_termination=True,
+        )
+        return values
+
+    def _enable_srq(self, inst: pyvisa.resources.MessageBasedResource) -> bool:
+        if self._srq_supported is False:
+            return False
+        try:
+            inst.discard_events(visa_constants.EventType.service_request, visa_constants.EventMechanism.queue)
+            inst.enable_event(visa_constants.EventType.service_request, visa_constants.EventMechanism.queue)
+        except (pyvisa.VisaIOError, NotImplementedError):
+            # SOCKET sessions typically lack SRQ support; fall back to blocking reads.
+            self._srq_supported = False
+            return False
+        self._srq_supported = True
+        return True
+
+    def _wait_for_srq(self, inst: pyvisa.resources.MessageBasedResource, wait_ms: int | None) -> None:
+        # Allow the trigger timeout on top of the normal I/O timeout so an aborted
+        # script cannot leave the worker blocked forever.
+        timeout = IO_TIMEOUT_MS if wait_ms is None else wait_ms + IO_TIMEOUT_MS
+        try:
+            inst.wait_on_event(visa_constants.EventType.service_request, timeout)
+            inst.read_stb()
+        except pyvisa.VisaIOError as exc:
+            if exc.error_code != visa_constants.VI_ERROR_TMO:
+                raise
+        finally:
             try:
-                values.append(float(token))
-            except ValueError:
-                continue
+                inst.disable_event(visa_constants.EventType.service_request, visa_constants.EventMechanism.queue)
+            except pyvisa.VisaIOError:
+                pass
+
+    def _parse_buffer(self, text: str) -> np.ndarray:
+        if not text:
+            return np.empty(0, dtype=np.float64)
+        # Commas become whitespace so empty fields and line breaks collapse into one separator.
+        values = np.fromstring(text.replace(",", " "), sep=" ", dtype=np.float64)
         return values
 
-    def _update_plot(self, voltages: list[float] | None) -> None:
-        if self.ax is None or self.canvas is None:
+    def _update_plot(self, voltages: np.ndarray | None) -> None:
+        if self.ax is None or self.canvas is None or self._line is None:
             return
-        self.ax.clear()
-        self.ax.set_xlabel("Sample")
-        self.ax.set_ylabel("Voltage (V)")
-        self.ax.grid(True, linestyle="--", alpha=0.6)
-        if voltages:
-            x_vals = list(range(1, len(voltages) + 1))
-            self.ax.plot(x_vals, voltages, marker="o", markersize=4, linewidth=1.5, color="tab:blue")
-            self.ax.fill_between(x_vals, voltages, color="tab:blue", alpha=0.15)
-            self.ax.set_xlim(0.5, len(voltages) + 0.5)
-        self.ax.set_title("Triggered capture")
-        self.canvas.draw_idle()
+        # Remove every collection, not just the last fill, so none can pile up.
+        for collection in list(self.ax.collections):
+            collection.remove()
+        self._fill = None
+        self._plot_count += 1
+        if self._plot_count % GC_EVERY_PLOTS == 0:
+            gc.collect()
+        if voltages is not None and voltages.size:
+            x_vals = np.arange(1, voltages.size + 1, dtype=np.int32)
+            y_vals = voltages
+            if voltages.size > PLOT_MAX_POINTS:
+                x_vals = np.linspace(1, voltages.size, PLOT_MAX_POINTS)
+                y_vals = np.interp(x_vals, np.arange(1, voltages.size + 1), voltages)
+            self._line.set_data(x_vals, y_vals)
+            self._fill = self.ax.fill_between(x_vals, y_vals, color="tab:blue", alpha=0.15)
+            self.ax.set_xlim(0.5, voltages.size + 0.5)
+            self.ax.relim()
+            self.ax.autoscale_view(scalex=False, scaley=True)
+        else:
+            self._line.set_data([], [])
+        self._plot_dirty = True
+        if not self._draw_scheduled:
+            self._draw_scheduled = True
+            self.root.after(PLOT_REDRAW_MS, self._do_draw)
+
+    def _do_draw(self) -> None:
+        self._draw_scheduled = False
+        if self._plot_dirty and self.canvas is not None:
+            self._plot_dirty = False
+            self.canvas.draw_idle()
 
     # ----------------------------------------------------------------- close --
     def on_close(self) -> None:
         try:
             self.disconnect()
         finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
             if self.figure:
                 plt.close(self.figure)
             self.root.destroy()
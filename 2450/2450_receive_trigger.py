@@ -11,11 +11,17 @@ parameters (line, edge, mode), and initiate the wait process.
 
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import functools
+import math
+import re
 import threading
 import tkinter as tk
 from tkinter import messagebox, scrolledtext, ttk
 
 import pyvisa
+from pyvisa import constants as visa_constants
 
 # --- Constants for GUI and Instrument Configuration ---
 
@@ -45,15 +51,36 @@ LINE_MODE_LOOKUP = {label: key for label, key in LINE_MODE_CHOICES}
 # Default values for the GUI controls.
 DEFAULT_LINE_LABEL = LINE_NUMBER_OPTIONS[0]
 DEFAULT_MODE_LABEL = LINE_MODE_CHOICES[0][0]
+# Maximum response size for the asynchronous wait read ("TRIGGER\n" etc.).
+ASYNC_READ_SIZE = 256
+# Read timeout (ms) used when discarding a CANCEL marker left over from a cancel.
+STALE_DRAIN_TIMEOUT_MS = 500
+# Number of error-queue entries fetched per refresh.
+ERROR_QUEUE_DEPTH = 16
+# Timeout entry text: any prefix of a non-negative number while typing, and a
+# complete one (optionally with an exponent) when the wait is started.
+_TIMEOUT_PARTIAL_RE = re.compile(r"\d*\.?\d*(e[-+]?\d*)?", re.IGNORECASE)
+_TIMEOUT_FULL_RE = re.compile(r"(\d+\.?\d*|\.\d+)(e[-+]?\d+)?", re.IGNORECASE)
+# One TSP chunk drains the error queue in a single round trip, printing
+# 'code,"message"' entries joined by ';' and stopping at the 0 (no error) entry.
+ERROR_QUERY = (
+    "local e = {} "
+    f"for i = 1, {ERROR_QUEUE_DEPTH} do "
+    "local c, m = errorqueue.next() "
+    "e[i] = string.format('%d,\"%s\"', c, tostring(m)) "
+    "if c == 0 then break end "
+    "end "
+    "print(table.concat(e, ';'))"
+)
 
 # --- TSP Script ---
-# This multi-line string contains the entire TSP script that will be loaded onto the 2450.
+# This multi-line string contains the entire TSP script that will be loaded onto the 2450,
+# with {name} standing in for SCRIPT_NAME.
 # The script includes functions for setting up the trigger, waiting for it,
 # displaying messages on the instrument screen, and handling cancellation.
 # It's designed to be self-contained and managed by the Python GUI.
-TSP_SCRIPT = """
+_SCRIPT_TEMPLATE = """
 loadscript {name}
-local receive_trigger_cancel_flag = false
 
 function receive_trigger_display_hello()
     display.changescreen(display.SCREEN_USER_SWIPE)
@@ -67,19 +94,15 @@ function receive_trigger_display_hey()
     display.settext(display.TEXT2, "")
 end
 
-function receive_trigger_cancel()
-    receive_trigger_cancel_flag = true
-end
-
 local DEFAULT_EDGE = "falling"
-local EDGE_MAP = {{
+local EDGE_MAP = {
     rising = trigger.EDGE_RISING,
     falling = trigger.EDGE_FALLING,
     either = trigger.EDGE_EITHER
-}}
+}
 local DEFAULT_LINE = 1
 local DEFAULT_MODE = "trigger_in"
-local MODE_MAP = {{
+local MODE_MAP = {
     digital_in = digio.MODE_DIGITAL_IN,
     digital_out = digio.MODE_DIGITAL_OUT,
     digital_open_drain = digio.MODE_DIGITAL_OPEN_DRAIN,
@@ -88,7 +111,7 @@ local MODE_MAP = {{
     trigger_open_drain = digio.MODE_TRIGGER_OPEN_DRAIN,
     synchronous_master = digio.MODE_SYNCHRONOUS_MASTER,
     synchronous_acceptor = digio.MODE_SYNCHRONOUS_ACCEPTOR
-}}
+}
 
 local function resolve_edge(edge_name)
     if edge_name == nil then
@@ -150,7 +173,6 @@ function receive_trigger_setup(edge_name, line_number, mode_name)
     local mode_value, mode_label = resolve_mode(mode_name)
     local line = resolve_line(line_number)
     ensure_line(line, edge, mode_value)
-    receive_trigger_cancel_flag = false
     display.changescreen(display.SCREEN_USER_SWIPE)
     display.settext(display.TEXT1, "Waiting for trigger")
     local text2 = string.format("DIGIO%d (%s, %s)", line, edge_label, mode_label)
@@ -162,7 +184,6 @@ function receive_trigger_wait(timeout, edge_name, line_number, mode_name)
     local mode_value, mode_label = resolve_mode(mode_name)
     local line = resolve_line(line_number)
     ensure_line(line, edge, mode_value)
-    receive_trigger_cancel_flag = false
     display.changescreen(display.SCREEN_USER_SWIPE)
     local info = string.format("DIGIO%d (%s, %s)", line, edge_label, mode_label)
     display.settext(display.TEXT1, "Waiting for trigger")
@@ -174,34 +195,10 @@ function receive_trigger_wait(timeout, edge_name, line_number, mode_name)
         return "INVALID_MODE"
     end
 
-    local triggered = false
-    local elapsed = 0
-    local chunk = 0.25
-
-    while not triggered and not receive_trigger_cancel_flag do
-        local wait_time = chunk
-        if timeout ~= nil then
-            if timeout <= elapsed then
-                break
-            end
-            if elapsed + wait_time > timeout then
-                wait_time = timeout - elapsed
-            end
-        end
-        if wait_time <= 0 then
-            break
-        end
-        triggered = trigger.digin[line].wait(wait_time)
-        if timeout ~= nil then
-            elapsed = elapsed + wait_time
-        end
-    end
+    -- A single blocking wait; the host cancels it with "abort".
+    local triggered = trigger.digin[line].wait(timeout or 100000)
 
-    if receive_trigger_cancel_flag then
-        display.settext(display.TEXT1, "Cancelled")
-        display.settext(display.TEXT2, "")
-        return "CANCEL"
-    elseif triggered then
+    if triggered then
         display.settext(display.TEXT1, "trig received")
         display.settext(display.TEXT2, "")
         return "TRIGGER"
@@ -218,13 +215,35 @@ function receive_trigger_clear_display()
     display.settext(display.TEXT2, "")
 end
 endscript
-""".format(name=SCRIPT_NAME)
+"""
+
+
+# Builds the script text on first use. The template has no format escapes, so a
+# plain replace substitutes the script name.
+@functools.cache
+def _tsp_script() -> str:
+    return _SCRIPT_TEMPLATE.replace("{name}", SCRIPT_NAME)
+
+
+# The upload payload, stripped and encoded once so reloads skip re-scanning the script.
+@functools.cache
+def _tsp_script_bytes() -> bytes:
+    return _tsp_script().strip().encode() + b"\n"
 
 
 # The main class for the GUI application.
 class ReceiveTriggerGUI:
     """Manages the GUI, instrument communication, and trigger waiting process."""
 
+    # Fixed commands pre-encoded with their terminator for write_raw, which
+    # skips pyvisa's per-call encode and termination handling.
+    _CMD_ABORT = b"abort\n"
+    _CMD_PRINT_CANCEL = b"print('CANCEL')\n"
+    _CMD_CLEAR = b"receive_trigger_clear_display()\n"
+    _CMD_HELLO = b"receive_trigger_display_hello()\n"
+    _CMD_HEY = b"receive_trigger_display_hey()\n"
+    _CMD_ERRORS = ERROR_QUERY.encode() + b"\n"
+
     def __init__(self, root: tk.Misc, *, owns_root: bool = True) -> None:
         self.root = root
         self._owns_root = owns_root
@@ -247,13 +266,43 @@ class ReceiveTriggerGUI:
         self.line_number_var = tk.StringVar(value=DEFAULT_LINE_LABEL)
         self.line_mode_var = tk.StringVar(value=DEFAULT_MODE_LABEL)
         self.timeout_var = tk.StringVar(value="")
-
-        # Threading and state management for the non-blocking wait operation
-        self.wait_thread: threading.Thread | None = None
+        self.query_idn_var = tk.BooleanVar(value=True)
+
+        # Threading and state management for the non-blocking wait operation.
+        # A single background event loop runs fallback waits, so no thread is
+        # created per wait.
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._loop_thread.start()
+        self._wait_future: concurrent.futures.Future[None] | None = None
+        self._async_handler = None
+        self._async_user_handle = None
+        self._async_buffer = None
+        self._async_job = None
         self.waiting = False
         self.cancel_requested = False
+        # Set once cancel_wait has sent the CANCEL marker; if the wait finished
+        # some other way, _stale_cancel records that the marker is still queued.
+        self._cancel_marker_sent = False
+        self._stale_cancel = False
         self.wait_context: dict[str, str] | None = None
 
+        # Last state applied to each action button, so unchanged buttons are skipped.
+        self._button_states: dict[ttk.Button, str] = {}
+
+        # Every (edge, line, mode) combination is known up front, so the setup
+        # commands (pre-encoded for write_raw) and the wait-command argument tails
+        # are built once here instead of on every click.
+        self._setup_commands: dict[tuple[str, int, str], bytes] = {}
+        self._wait_command_tails: dict[tuple[str, int, str], str] = {}
+        for edge in EDGE_OPTIONS:
+            for line_label in LINE_NUMBER_OPTIONS:
+                for _, mode_key in LINE_MODE_CHOICES:
+                    key = (edge, int(line_label), mode_key)
+                    args = f"'{edge}', {line_label}, '{mode_key}'"
+                    self._setup_commands[key] = f"receive_trigger_setup({args})\n".encode()
+                    self._wait_command_tails[key] = f", {args}))"
+
         self._build_ui()
         if self._owns_root and hasattr(self._window, "protocol"):
             self._window.protocol("WM_DELETE_WINDOW", self.on_close)
@@ -279,23 +328,32 @@ class ReceiveTriggerGUI:
 
         # Trigger configuration options
         ttk.Label(frame, text="Edge:").grid(column=0, row=1, sticky="w", pady=(12, 0))
-        edge_combo = ttk.Combobox(frame, textvariable=self.edge_var, values=EDGE_OPTIONS, state="readonly", width=12)
-        edge_combo.grid(column=1, row=1, sticky="w", pady=(12, 0))
+        self.edge_combo = ttk.Combobox(
+            frame, textvariable=self.edge_var, values=EDGE_OPTIONS, state="readonly", width=12
+        )
+        self.edge_combo.grid(column=1, row=1, sticky="w", pady=(12, 0))
 
         ttk.Label(frame, text="DIGIO line:").grid(column=0, row=2, sticky="w", pady=(6, 0))
-        line_combo = ttk.Combobox(
+        self.line_combo = ttk.Combobox(
             frame, textvariable=self.line_number_var, values=LINE_NUMBER_OPTIONS, state="readonly", width=6
         )
-        line_combo.grid(column=1, row=2, sticky="w", pady=(6, 0))
+        self.line_combo.grid(column=1, row=2, sticky="w", pady=(6, 0))
 
         ttk.Label(frame, text="Line mode:").grid(column=0, row=3, sticky="w", pady=(6, 0))
-        mode_combo = ttk.Combobox(
+        self.mode_combo = ttk.Combobox(
             frame, textvariable=self.line_mode_var, values=LINE_MODE_LABELS, state="readonly", width=32
         )
-        mode_combo.grid(column=1, row=3, columnspan=3, sticky="w", pady=(6, 0))
+        self.mode_combo.grid(column=1, row=3, columnspan=3, sticky="w", pady=(6, 0))
 
         ttk.Label(frame, text="Timeout (s, blank = indefinite):").grid(column=0, row=4, sticky="w")
-        ttk.Entry(frame, textvariable=self.timeout_var, width=12).grid(column=1, row=4, sticky="w")
+        # Key-level validation keeps the entry numeric, so no parse is needed on click.
+        timeout_vcmd = (self.root.register(self._validate_timeout), "%P")
+        ttk.Entry(
+            frame, textvariable=self.timeout_var, width=12, validate="key", validatecommand=timeout_vcmd
+        ).grid(column=1, row=4, sticky="w")
+        ttk.Checkbutton(frame, text="Query *IDN? on connect", variable=self.query_idn_var).grid(
+            column=2, row=4, columnspan=2, sticky="w"
+        )
 
         # Action buttons
         button_row = ttk.Frame(frame)
@@ -324,7 +382,10 @@ class ReceiveTriggerGUI:
         log_frame.grid(column=0, row=6, columnspan=6, sticky="nsew", pady=(12, 0))
         frame.rowconfigure(6, weight=1)
 
-        self.log_text = scrolledtext.ScrolledText(log_frame, height=12, state=tk.DISABLED)
+        # The log stays in NORMAL state; swallowing key presses keeps it read-only
+        # without toggling the state around every insert.
+        self.log_text = scrolledtext.ScrolledText(log_frame, height=12)
+        self.log_text.bind("<Key>", lambda _event: "break")
         self.log_text.pack(fill=tk.BOTH, expand=True)
 
         # Status bar at the bottom
@@ -354,9 +415,14 @@ class ReceiveTriggerGUI:
             self.inst.read_termination = "\n"
             self.inst.write_termination = "\n"
             self.inst.timeout = 20000
-            idn = self.inst.query("*IDN?").strip()
-            self._log(f"Connected: {idn}")
-            self.status_var.set(f"Connected to {idn}")
+            # The identity query is optional to save a round trip on quick reconnects.
+            if self.query_idn_var.get():
+                idn = self.inst.query("*IDN?").strip()
+                self._log(f"Connected: {idn}")
+                self.status_var.set(f"Connected to {idn}")
+            else:
+                self._log(f"Connected: {address}")
+                self.status_var.set(f"Connected ({address})")
             # Load the TSP script onto the instrument.
             self._load_script()
             self._set_buttons(True, False)
@@ -371,23 +437,21 @@ class ReceiveTriggerGUI:
         # If a wait operation is in progress, try to abort it.
         if self.waiting and self.inst:
             try:
-                self.inst.write("abort")
+                self.inst.write_raw(self._CMD_ABORT)
             except pyvisa.VisaIOError:
                 pass
         self.waiting = False
         self.wait_context = None
-        # Close the instrument and resource manager sessions.
+        self._cancel_marker_sent = False
+        self._stale_cancel = False
+        self._remove_async_handler()
+        # Close the instrument session. The resource manager is kept so a
+        # reconnect skips VISA library initialization; on_close releases it.
         if self.inst is not None:
             try:
                 self.inst.close()
             except pyvisa.VisaIOError:
                 pass
-        if self.rm is not None:
-            try:
-                self.rm.close()
-            except pyvisa.VisaIOError:
-                pass
-        self.rm = None
         self.inst = None
         self.script_loaded = False
         self._log("Disconnected.")
@@ -405,8 +469,9 @@ class ReceiveTriggerGUI:
             # Ignore error if script doesn't exist.
             pass
         try:
-            for line in TSP_SCRIPT.strip().splitlines():
-                self.inst.write(line)
+            # Send the whole script in one raw write; write_raw skips the
+            # termination handling, so the embedded newlines go out as-is.
+            self.inst.write_raw(_tsp_script_bytes())
             self.inst.write(f"{SCRIPT_NAME}.save()")
             self.inst.write(f"{SCRIPT_NAME}()")
             self.script_loaded = True
@@ -421,7 +486,7 @@ class ReceiveTriggerGUI:
     def setup_trigger(self) -> None:
         if not self._check_ready():
             return
-        edge = self.edge_var.get().strip().lower()
+        edge = self._resolve_edge()
         try:
             line_number = self._resolve_line_number()
             mode_key, mode_label = self._resolve_mode_selection()
@@ -429,10 +494,12 @@ class ReceiveTriggerGUI:
             messagebox.showerror("Setup", str(exc))
             return
 
-        edge_arg = f"'{edge}'" if edge else "nil"
         try:
-            cmd = f"receive_trigger_setup({edge_arg}, {line_number}, '{mode_key}')"
-            self.inst.write(cmd)
+            cmd = self._setup_commands.get((edge, line_number, mode_key))
+            if cmd is None:
+                edge_arg = f"'{edge}'" if edge else "nil"
+                cmd = f"receive_trigger_setup({edge_arg}, {line_number}, '{mode_key}')\n".encode()
+            self.inst.write_raw(cmd)
             self._log(
                 f"Setup complete. DIGIO{line_number} configured for {mode_label} mode (edge={edge or 'default'})."
             )
@@ -448,15 +515,10 @@ class ReceiveTriggerGUI:
             messagebox.showinfo("Wait", "Already waiting for a trigger.")
             return
 
-        try:
-            timeout_arg = self._format_timeout_arg()
-        except ValueError as exc:
-            messagebox.showerror("Wait", str(exc))
-            return
-
-        edge = self.edge_var.get().strip().lower()
+        edge = self._resolve_edge()
 
         try:
+            timeout_arg = self._format_timeout_arg()
             line_number = self._resolve_line_number()
             mode_key, mode_label = self._resolve_mode_selection()
         except ValueError as exc:
@@ -476,20 +538,93 @@ class ReceiveTriggerGUI:
             f"Waiting for trigger on DIGIO{line_number} ({mode_label}, edge={edge or 'default'}, timeout={timeout_arg})."
         )
 
-        # Start a new thread to perform the blocking wait operation,
-        # so the GUI remains responsive.
-        self.wait_thread = threading.Thread(
-            target=self._wait_worker, args=(timeout_arg, edge, line_number, mode_key), daemon=True
-        )
-        self.wait_thread.start()
+        tail = self._wait_command_tails.get((edge, line_number, mode_key))
+        if tail is None:
+            edge_arg = f"'{edge}'" if edge else "nil"
+            tail = f", {edge_arg}, {line_number}, '{mode_key}'))"
+        cmd = "print(receive_trigger_wait(" + timeout_arg + tail
+        self._drain_stale_cancel()
+        try:
+            if self._start_async_wait(cmd):
+                return
+        except pyvisa.VisaIOError as exc:
+            self._async_complete_wait(result=None, error=str(exc))
+            return
+
+        # The backend has no asynchronous read support, so run the blocking query
+        # on the background loop, keeping the GUI responsive.
+        self._wait_future = asyncio.run_coroutine_threadsafe(self._wait_worker(cmd), self._loop)
 
-    # This function runs in a separate thread to wait for the instrument's response.
-    def _wait_worker(self, timeout_expr: str, edge: str, line_number: int, mode_key: str) -> None:
+    # Issues the wait command and completes it through a VISA I/O-completion callback.
+    # Returns False if the backend cannot do asynchronous reads; once the command is
+    # sent, a missing asynchronous read falls back to a blocking read instead.
+    def _start_async_wait(self, cmd: str) -> bool:
         assert self.inst is not None
-        edge_arg = f"'{edge}'" if edge else "nil"
-        cmd = f"print(receive_trigger_wait({timeout_expr}, {edge_arg}, {line_number}, '{mode_key}'))"
         try:
-            response = self.inst.query(cmd).strip().upper()
+            self._async_handler = self.inst.wrap_handler(self._on_read_complete)
+            self._async_user_handle = self.inst.install_handler(
+                visa_constants.EventType.io_completion, self._async_handler
+            )
+            self.inst.enable_event(visa_constants.EventType.io_completion, visa_constants.EventMechanism.handler)
+        except (pyvisa.VisaIOError, NotImplementedError):
+            self._remove_async_handler()
+            return False
+        try:
+            self.inst.write(cmd)
+            # Keep the buffer referenced until the read completes; VISA writes into it.
+            self._async_buffer, self._async_job, _ = self.inst.visalib.read_asynchronously(
+                self.inst.session, ASYNC_READ_SIZE
+            )
+        except NotImplementedError:
+            # The command is already out; read its reply without sending it again.
+            self._remove_async_handler()
+            self._wait_future = asyncio.run_coroutine_threadsafe(self._wait_worker(None), self._loop)
+        except pyvisa.VisaIOError:
+            self._remove_async_handler()
+            raise
+        return True
+
+    # Runs on a VISA thread when the asynchronous read completes.
+    def _on_read_complete(self, resource, event, user_handle) -> None:
+        self._async_job = None
+        self._async_buffer = None
+        self.root.after(0, self._remove_async_handler)
+        if event.status < visa_constants.StatusCode.success:
+            self._async_complete_wait(result=None, error=str(pyvisa.VisaIOError(event.status)))
+            return
+        response = bytes(event.data).decode(errors="replace").strip().upper()
+        self._async_complete_wait(result=response)
+
+    # Disables the I/O-completion event and uninstalls its handler.
+    def _remove_async_handler(self) -> None:
+        if self._async_handler is None or self.inst is None:
+            self._async_handler = None
+            return
+        try:
+            self.inst.disable_event(visa_constants.EventType.io_completion, visa_constants.EventMechanism.handler)
+        except pyvisa.VisaIOError:
+            pass
+        try:
+            self.inst.uninstall_handler(
+                visa_constants.EventType.io_completion, self._async_handler, self._async_user_handle
+            )
+        except pyvisa.VisaIOError:
+            pass
+        self._async_handler = None
+        self._async_user_handle = None
+
+    # Fallback coroutine that awaits the blocking query in the loop's executor.
+    # With cmd=None the command was already written and only the reply is read.
+    async def _wait_worker(self, cmd: str | None) -> None:
+        inst = self.inst
+        assert inst is not None
+        try:
+            loop = asyncio.get_running_loop()
+            if cmd is None:
+                raw = await loop.run_in_executor(None, inst.read)
+            else:
+                raw = await loop.run_in_executor(None, inst.query, cmd)
+            response = raw.strip().upper()
         except pyvisa.VisaIOError as exc:
             self._async_complete_wait(result=None, error=str(exc))
             return
@@ -539,29 +674,52 @@ class ReceiveTriggerGUI:
                 self._log(f"Wait result: {result}")
                 self.status_var.set(f"Wait result: {result}")
 
+            # A wait that ended before the abort landed leaves the marker queued.
+            if self._cancel_marker_sent and res != "CANCEL":
+                self._stale_cancel = True
+            self._cancel_marker_sent = False
             self.cancel_requested = False
             self.wait_context = None
 
         self.root.after(0, finish)
 
-    # Sends a command to the instrument to cancel the current wait operation.
+    # Aborts the in-flight wait on the instrument, then prints CANCEL so the
+    # pending read completes immediately instead of timing out.
     def cancel_wait(self) -> None:
         if not self.waiting or self.inst is None:
             return
         self.cancel_requested = True
         try:
-            self.inst.write("receive_trigger_cancel()")
+            self.inst.write_raw(self._CMD_ABORT)
+            self.inst.write_raw(self._CMD_PRINT_CANCEL)
+            self._cancel_marker_sent = True
             self._log(f"Cancel requested for {self._describe_wait_context()}.")
         except pyvisa.VisaIOError as exc:
             self.cancel_requested = False
             self._log(f"Cancel wait failed: {exc}")
 
+    # Reads and discards a CANCEL marker left queued by a cancel that raced the
+    # end of its wait, so the next read gets its own response.
+    def _drain_stale_cancel(self) -> None:
+        if not self._stale_cancel or self.inst is None:
+            return
+        self._stale_cancel = False
+        previous_timeout = self.inst.timeout
+        self.inst.timeout = STALE_DRAIN_TIMEOUT_MS
+        try:
+            while self.inst.read().strip().upper() != "CANCEL":
+                pass
+        except pyvisa.VisaIOError:
+            pass
+        finally:
+            self.inst.timeout = previous_timeout
+
     # Sends a command to clear the instrument's user display.
     def clear_display(self) -> None:
         if not self._check_ready():
             return
         try:
-            self.inst.write("receive_trigger_clear_display()")
+            self.inst.write_raw(self._CMD_CLEAR)
             self._log("Display cleared.")
         except pyvisa.VisaIOError as exc:
             self._log(f"Clear display failed: {exc}")
@@ -571,7 +729,7 @@ class ReceiveTriggerGUI:
         if not self._check_ready():
             return
         try:
-            self.inst.write("receive_trigger_display_hello()")
+            self.inst.write_raw(self._CMD_HELLO)
             self._log("Display set to 'Hello'.")
         except pyvisa.VisaIOError as exc:
             self._log(f"Display hello failed: {exc}")
@@ -581,41 +739,46 @@ class ReceiveTriggerGUI:
         if not self._check_ready():
             return
         try:
-            self.inst.write("receive_trigger_display_hey()")
+            self.inst.write_raw(self._CMD_HEY)
             self._log("Display set to 'Hey'.")
         except pyvisa.VisaIOError as exc:
             self._log(f"Display hey failed: {exc}")
 
-    # Parses the timeout value from the GUI entry.
+    # Tk validatecommand for the timeout entry: allows blank or anything that can
+    # still grow into a number >= 0, so ".5" and "1e-3" can be typed key by key.
+    def _validate_timeout(self, proposed: str) -> bool:
+        return _TIMEOUT_PARTIAL_RE.fullmatch(proposed) is not None
+
+    # Returns the timeout argument, or raises ValueError if the entry holds only
+    # a partial or non-finite number.
     def _format_timeout_arg(self) -> str:
-        text = self.timeout_var.get().strip()
+        text = self.timeout_var.get()
         if not text:
             return "nil"
-        try:
-            value = float(text)
-        except ValueError as exc:
-            raise ValueError("Timeout must be numeric.") from exc
-        if value < 0:
-            raise ValueError("Timeout must be >= 0.")
-        return f"{value}"
-
-    # Parses the DIGIO line number from the GUI combobox.
+        if _TIMEOUT_FULL_RE.fullmatch(text) is None or not math.isfinite(float(text)):
+            raise ValueError(f"Invalid timeout: {text!r}")
+        return text
+
+    # The comboboxes are read-only, so their selected index maps straight into
+    # the option tuples without parsing the displayed text.
+    # Returns the selected trigger edge, or "" (instrument default) if none is selected.
+    def _resolve_edge(self) -> str:
+        index = self.edge_combo.current()
+        return EDGE_OPTIONS[index] if index >= 0 else ""
+
+    # Returns the selected DIGIO line number.
     def _resolve_line_number(self) -> int:
-        value = self.line_number_var.get().strip() or DEFAULT_LINE_LABEL
-        try:
-            number = int(value)
-        except ValueError as exc:
-            raise ValueError("Select a valid DIGIO line (1-6).") from exc
-        if not 1 <= number <= 6:
-            raise ValueError("DIGIO line must be between 1 and 6.")
-        return number
+        index = self.line_combo.current()
+        if index < 0:
+            raise ValueError("Select a valid DIGIO line (1-6).")
+        return int(LINE_NUMBER_OPTIONS[index])
 
-    # Parses the line mode from the GUI combobox.
+    # Returns the (TSP key, label) pair for the selected line mode.
     def _resolve_mode_selection(self) -> tuple[str, str]:
-        label = self.line_mode_var.get()
-        key = LINE_MODE_LOOKUP.get(label)
-        if not key:
+        index = self.mode_combo.current()
+        if index < 0:
             raise ValueError("Select a valid line mode.")
+        label, key = LINE_MODE_CHOICES[index]
         return key, label
 
     # Checks if the instrument is connected and the script is loaded.
@@ -632,10 +795,8 @@ class ReceiveTriggerGUI:
     # ------------------------------------------------------------- Logging --
     # Appends a message to the log text widget.
     def _log(self, message: str) -> None:
-        self.log_text.configure(state=tk.NORMAL)
         self.log_text.insert(tk.END, message + "\n")
         self.log_text.see(tk.END)
-        self.log_text.configure(state=tk.DISABLED)
 
     def _set_buttons(self, connected: bool, waiting: bool) -> None:
         """Enable or disable GUI buttons based on the application's state."""
@@ -644,12 +805,18 @@ class ReceiveTriggerGUI:
         cancel_state = "normal" if connected and waiting else "disabled"
         clear_state = "normal" if connected else "disabled"
 
-        self.btn_setup.configure(state=setup_state)
-        self.btn_wait.configure(state=wait_state)
-        self.btn_cancel.configure(state=cancel_state)
-        self.btn_hello.configure(state=clear_state)
-        self.btn_hey.configure(state=clear_state)
-        self.btn_clear.configure(state=clear_state)
+        self._set_button_state(self.btn_setup, setup_state)
+        self._set_button_state(self.btn_wait, wait_state)
+        self._set_button_state(self.btn_cancel, cancel_state)
+        self._set_button_state(self.btn_hello, clear_state)
+        self._set_button_state(self.btn_hey, clear_state)
+        self._set_button_state(self.btn_clear, clear_state)
+
+    # Applies a button state only when it differs from the last one applied.
+    def _set_button_state(self, button: ttk.Button, state: str) -> None:
+        if self._button_states.get(button) != state:
+            button.configure(state=state)
+            self._button_states[button] = state
 
     # Creates a descriptive string for the current wait operation for logging.
     def _describe_wait_context(self) -> str:
@@ -679,7 +846,7 @@ class ReceiveTriggerGUI:
         frame = ttk.Frame(self.err_win, padding=8)
         frame.pack(fill=tk.BOTH, expand=True)
 
-        self.err_text = scrolledtext.ScrolledText(frame, width=60, height=18, state=tk.NORMAL)
+        self.err_text = scrolledtext.ScrolledText(frame, width=60, height=18, state=tk.DISABLED)
         self.err_text.pack(fill=tk.BOTH, expand=True)
 
         controls = ttk.Frame(frame)
@@ -706,12 +873,18 @@ class ReceiveTriggerGUI:
             return
         try:
             lines: list[str] = []
-            for _ in range(16):
-                err = self.inst.query("SYST:ERR?").strip()
+            self._drain_stale_cancel()
+            self.inst.write_raw(self._CMD_ERRORS)
+            for err in self.inst.read().split(";"):
+                err = err.strip()
                 lines.append(err)
                 if err.startswith("0,"):
                     break
-            self.err_text.insert(tk.END, "\n".join(lines) + "\n")
+            # One insert per refresh; the pane is writable only for that insert.
+            block = "\n".join(lines) + "\n"
+            self.err_text.configure(state=tk.NORMAL)
+            self.err_text.insert(tk.END, block)
+            self.err_text.configure(state=tk.DISABLED)
             self.err_text.see(tk.END)
         except pyvisa.VisaIOError as exc:
             messagebox.showerror("Errors", f"Failed to read errors: {exc}")
@@ -719,12 +892,21 @@ class ReceiveTriggerGUI:
     # Clears the text in the error window.
     def clear_error_window(self) -> None:
         if self.err_text:
+            self.err_text.configure(state=tk.NORMAL)
             self.err_text.delete("1.0", tk.END)
+            self.err_text.configure(state=tk.DISABLED)
 
     # --------------------------------------------------------------- Close --
     # Handles the main window closing event.
     def on_close(self) -> None:
         self.disconnect()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self.rm is not None:
+            try:
+                self.rm.close()
+            except pyvisa.VisaIOError:
+                pass
+            self.rm = None
         if self._owns_root:
             try:
                 self._window.destroy()
@@ -1,11 +1,18 @@
 """Tkinter GUI for controlling the measure-voltage.tsp script."""
 
+import functools
+import hashlib
+import math
 import pathlib
+import queue
+import threading
 import tkinter as tk
+from collections import deque
 from tkinter import messagebox, ttk
 
-import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+import numpy as np
 import pyvisa
 import sys
 
@@ -13,6 +20,43 @@ import sys
 DEFAULT_ADDRESS = "TCPIP0::169.254.188.69::5025::SOCKET"
 SCRIPT_NAME = "VoltmeterScript"
 SCRIPT_FILE = pathlib.Path(__file__).with_name("test_2450_measure-voltage.tsp")
+# Global set by the uploaded script so a reconnect can tell whether it is current.
+SCRIPT_VERSION_VAR = f"{SCRIPT_NAME}_v"
+# The script does not change while the GUI runs, so read and hash it once at import.
+SCRIPT_TEXT = SCRIPT_FILE.read_text(encoding="utf-8").strip() if SCRIPT_FILE.exists() else None
+SCRIPT_VERSION = hashlib.sha1(SCRIPT_TEXT.encode("utf-8")).hexdigest()[:12] if SCRIPT_TEXT else ""
+RESULT_POLL_MS = 50
+LOG_MAX_LINES = 500
+PLOT_INITIAL_CAPACITY = 1024
+PLOT_REDRAW_MS = 100
+# Large enough that a long printbuffer arrives in one VISA read.
+READ_CHUNK_SIZE = 1 << 20
+# Fetch defbuffer1 as little-endian REAL32 instead of ASCII CSV. Set to False for
+# firmware without binary printbuffer support.
+BINARY_BUFFER = True
+BUFFER_COMMAND = "printbuffer(1, defbuffer1.n, defbuffer1)"
+BINARY_BUFFER_COMMAND = f"format.data = format.REAL32 {BUFFER_COMMAND} format.data = format.ASCII"
+
+
+_RM_SINGLETON: pyvisa.ResourceManager | None = None
+_RM_LOCK = threading.Lock()
+
+
+def _get_rm() -> pyvisa.ResourceManager:
+    """Return the process-wide ResourceManager, creating it on first use."""
+    global _RM_SINGLETON
+    with _RM_LOCK:
+        if _RM_SINGLETON is None:
+            _RM_SINGLETON = pyvisa.ResourceManager()
+        return _RM_SINGLETON
+
+
+# Repeated Measure clicks usually reuse the same settings, so keep the built command lines.
+@functools.lru_cache(maxsize=16)
+def _measure_command(samples: int, range_arg: str, nplc_arg: str) -> str:
+    buffer_command = BINARY_BUFFER_COMMAND if BINARY_BUFFER else BUFFER_COMMAND
+    # One command line: the result line comes back first, then the buffer.
+    return f"print(measure_voltage({samples}, {range_arg}, {nplc_arg})) {buffer_command}"
 
 
 class VoltmeterGUI:
@@ -33,6 +77,22 @@ class VoltmeterGUI:
         self.figure = None
         self.ax = None
         self.canvas = None
+        self._tk_canvas = None
+        self.line = None
+        self._bg = None
+        # Preallocated plot slabs; readings are copied in and the line views the first _n.
+        self._x = np.arange(1, PLOT_INITIAL_CAPACITY + 1, dtype=np.float64)
+        self._y = np.empty(PLOT_INITIAL_CAPACITY, dtype=np.float64)
+        self._n = 0
+        self._dirty = False
+        self._draw_scheduled = False
+        self.measure_button: ttk.Button | None = None
+
+        # Measurements run on a worker thread; results come back through this queue.
+        self._result_q: queue.Queue[tuple[bool, str, np.ndarray]] = queue.Queue()
+        self._measure_thread: threading.Thread | None = None
+        self._log_queue: deque[str] = deque()
+        self._log_flush_pending = False
 
         self._build_ui()
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
@@ -62,7 +122,8 @@ class VoltmeterGUI:
         ttk.Label(frame, text="NPLC:").grid(column=0, row=3, sticky="w")
         ttk.Entry(frame, textvariable=self.nplc_var, width=10).grid(column=1, row=3, sticky="w")
 
-        ttk.Button(frame, text="Measure", command=self.measure).grid(column=0, row=4, pady=(12, 0), sticky="w")
+        self.measure_button = ttk.Button(frame, text="Measure", command=self._start_measure)
+        self.measure_button.grid(column=0, row=4, pady=(12, 0), sticky="w")
         ttk.Button(frame, text="Output Off", command=self.output_off).grid(column=1, row=4, pady=(12, 0), sticky="w")
 
         # Output log
@@ -77,14 +138,29 @@ class VoltmeterGUI:
         plot_frame.columnconfigure(0, weight=1)
         plot_frame.rowconfigure(0, weight=1)
 
-        self.figure, self.ax = plt.subplots(figsize=(8, 4.5))
+        # A bare Figure keeps pyplot's global figure manager out of the draw path.
+        self.figure = Figure(figsize=(8, 4.5))
+        self.ax = self.figure.add_subplot(111)
         self.figure.subplots_adjust(left=0.1, right=0.97, bottom=0.15, top=0.9)
         self.ax.set_xlabel("Sample")
         self.ax.set_ylabel("Voltage (V)")
         self.ax.grid(True, linestyle="--", alpha=0.6)
+        self.ax.set_title("Measured Voltages")
+        # Animated, so full draws leave it out of the cached background used for blitting.
+        (self.line,) = self.ax.plot(
+            [], [], marker="o", markersize=5, linewidth=1.5, color="tab:blue", animated=True
+        )
         self.canvas = FigureCanvasTkAgg(self.figure, master=plot_frame)
-        self.canvas.get_tk_widget().configure(highlightthickness=0)
-        self.canvas.get_tk_widget().grid(column=0, row=0, sticky="nsew")
+        self._tk_canvas = self.canvas.get_tk_widget()
+        self._tk_canvas.configure(highlightthickness=0)
+        self._tk_canvas.grid(column=0, row=0, sticky="nsew")
+        # Bound once for the blit path in _maybe_draw.
+        self._restore = self.canvas.restore_region
+        self._blit = self.canvas.blit
+        self._draw_line = functools.partial(self.ax.draw_artist, self.line)
+        # Every full draw (first show, resize, limit change) recaptures the background.
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.canvas.draw()
 
     # ------------------------------------------------------------ connection --
     def connect(self) -> None:
@@ -93,11 +169,11 @@ class VoltmeterGUI:
             messagebox.showerror("Connect", "Please provide a VISA address.")
             return
         try:
-            if self.rm is None:
-                self.rm = pyvisa.ResourceManager()
+            self.rm = _get_rm()
             self.inst = self.rm.open_resource(address)
             self.inst.read_termination = "\n"
             self.inst.write_termination = "\n"
+            self.inst.chunk_size = READ_CHUNK_SIZE
             self.inst.timeout = 15000
             idn = self.inst.query("*IDN?").strip()
             self._log(f"Connected to {idn}")
@@ -108,15 +184,16 @@ class VoltmeterGUI:
             self.inst = None
 
     def disconnect(self) -> None:
+        if self._measure_thread is not None and self._measure_thread.is_alive():
+            messagebox.showwarning("Disconnect", "Wait for the measurement to finish first.")
+            return
         if self.inst is not None:
             try:
                 self.inst.write("pcall(voltmeter_output_off)")
             except pyvisa.VisaIOError:
                 pass
             self.inst.close()
-        if self.rm is not None:
-            self.rm.close()
-        self.rm = None
+        # The ResourceManager is shared and kept open so reconnects skip VISA init.
         self.inst = None
         self.script_loaded = False
         self._log("Disconnected.")
@@ -125,35 +202,48 @@ class VoltmeterGUI:
     def _load_script(self) -> None:
         if self.inst is None or self.script_loaded:
             return
-        if not SCRIPT_FILE.exists():
+        if SCRIPT_TEXT is None:
             messagebox.showerror("Script", f"TSP file not found: {SCRIPT_FILE}")
             return
-        script_text = SCRIPT_FILE.read_text(encoding="utf-8")
 
         try:
-            self.inst.write(f"pcall(script.delete, '{SCRIPT_NAME}')")
+            # Run a saved copy (e.g. after a power cycle) so its version global is defined.
+            current = self.inst.query(
+                f"if {SCRIPT_NAME} ~= nil then {SCRIPT_NAME}() end print({SCRIPT_VERSION_VAR} or '')"
+            ).strip()
         except pyvisa.VisaIOError:
-            pass
+            current = ""
+        upload = current != SCRIPT_VERSION
+
+        if upload:
+            try:
+                self.inst.write(f"pcall(script.delete, '{SCRIPT_NAME}')")
+            except pyvisa.VisaIOError:
+                pass
 
         try:
-            self.inst.write(f"loadscript {SCRIPT_NAME}")
-            for line in script_text.splitlines():
-                self.inst.write(line)
-            self.inst.write("endscript")
-            self.inst.write(f"{SCRIPT_NAME}.save()")
-            self.inst.write(f"{SCRIPT_NAME}()")
+            if upload:
+                self.inst.write(
+                    f"loadscript {SCRIPT_NAME}\n{SCRIPT_TEXT}\n"
+                    f"{SCRIPT_VERSION_VAR} = '{SCRIPT_VERSION}'\nendscript"
+                )
+                self.inst.write(f"{SCRIPT_NAME}.save()")
+                self.inst.write(f"{SCRIPT_NAME}()")
             self.inst.write("pcall(voltmeter_output_off)")
+            self.inst.write("format.byteorder = format.LITTLEENDIAN")
             self.script_loaded = True
-            self._log("TSP script loaded.")
+            self._log("TSP script loaded." if upload else f"TSP script {SCRIPT_VERSION} already on instrument.")
         except pyvisa.VisaIOError as exc:
             messagebox.showerror("Script", f"Failed to load script: {exc}")
             self._log(f"Script load failed: {exc}")
 
     # --------------------------------------------------------------- measure --
-    def measure(self) -> None:
+    def _start_measure(self) -> None:
         if self.inst is None:
             messagebox.showwarning("Measure", "Connect to the instrument first.")
             return
+        if self._measure_thread is not None and self._measure_thread.is_alive():
+            return
         if not self.script_loaded:
             self._load_script()
         try:
@@ -168,21 +258,64 @@ class VoltmeterGUI:
             messagebox.showerror("Measure", str(exc))
             return
 
+        self.measure_button.configure(state=tk.DISABLED)
+        self._measure_thread = threading.Thread(
+            target=self._measure_worker, args=(samples, range_arg, nplc_arg), daemon=True
+        )
+        self._measure_thread.start()
+        self.root.after(RESULT_POLL_MS, self._drain_results)
+
+    # Runs on the worker thread: VISA I/O only, no Tk calls.
+    def _measure_worker(self, samples: int, range_arg: str, nplc_arg: str) -> None:
         try:
-            response = self.inst.query(
-                f"print(measure_voltage({samples}, {range_arg}, {nplc_arg}))"
-            ).strip()
-            self._log(f"Result: {response}")
-
-            buffer_values = self.inst.query("printbuffer(1, defbuffer1.n, defbuffer1)").strip()
-            voltages = self._parse_buffer(buffer_values)
-            if voltages:
-                self._log("Buffer voltages (V):")
-                self._log(", ".join(f"{v:.6f}" for v in voltages))
-                self._update_plot(voltages)
-        except pyvisa.VisaIOError as exc:
-            messagebox.showerror("Measure", f"Measurement failed: {exc}")
-            self._log(f"Measurement failed: {exc}")
+            response = self.inst.query(_measure_command(samples, range_arg, nplc_arg)).strip()
+            # A request above the buffer capacity prints a notice before the result line.
+            if response.startswith("Requested"):
+                response = f"{response} {self.inst.read().strip()}"
+            if BINARY_BUFFER:
+                # The result line ends with defbuffer1.n. printbuffer sends an indefinite
+                # (#0) block, so without a count the read would stop at the first 0x0A
+                # byte inside the float data.
+                points = int(float(response.split()[-1]))
+                voltages = self.inst.read_binary_values(
+                    datatype="f",
+                    is_big_endian=False,
+                    container=np.ndarray,
+                    data_points=points,
+                    expect_termination=True,
+                )
+            else:
+                voltages = self._parse_buffer(self.inst.read().strip())
+        except Exception as exc:
+            # Always post a result; _drain_results polls until one arrives.
+            self._result_q.put((False, str(exc), np.empty(0)))
+            return
+        self._result_q.put((True, response, voltages))
+
+    def _drain_results(self) -> None:
+        try:
+            ok, response, voltages = self._result_q.get_nowait()
+        except queue.Empty:
+            self.root.after(RESULT_POLL_MS, self._drain_results)
+            return
+        self.measure_button.configure(state=tk.NORMAL)
+        if not ok:
+            messagebox.showerror("Measure", f"Measurement failed: {response}")
+            self._log(f"Measurement failed: {response}")
+            return
+        self._log(f"Result: {response}")
+        if voltages.size:
+            self._log("Buffer voltages (V):")
+            self._log(
+                np.array2string(
+                    voltages,
+                    formatter={"float_kind": lambda x: format(x, ".6f")},
+                    separator=", ",
+                    threshold=50,
+                    max_line_width=120,
+                )
+            )
+            self._update_plot(voltages)
 
     def output_off(self) -> None:
         if self.inst is None:
@@ -199,57 +332,98 @@ class VoltmeterGUI:
         if not text:
             return "nil"
         try:
-            float(text)
+            value = float(text)
         except ValueError:
             raise ValueError(f"Invalid numeric value: {text}")
-        return text
+        # inf/nan would repr as names Lua reads as undefined globals.
+        if not math.isfinite(value):
+            raise ValueError(f"Invalid numeric value: {text}")
+        # repr gives the canonical form, so the instrument never sees the raw entry text.
+        return repr(value)
 
     def _log(self, message: str) -> None:
+        self._log_queue.append(message)
+        if not self._log_flush_pending:
+            self._log_flush_pending = True
+            self.root.after_idle(self._flush_log)
+
+    def _flush_log(self) -> None:
+        self._log_flush_pending = False
+        if not self._log_queue:
+            return
+        batch = "\n".join(self._log_queue)
+        self._log_queue.clear()
         self.output.configure(state=tk.NORMAL)
-        self.output.insert(tk.END, message + "\n")
+        self.output.insert(tk.END, batch + "\n")
+        lines = int(self.output.index("end-1c").split(".")[0]) - 1
+        if lines > LOG_MAX_LINES:
+            self.output.delete("1.0", f"{lines - LOG_MAX_LINES + 1}.0")
         self.output.see(tk.END)
         self.output.configure(state=tk.DISABLED)
 
-    def _parse_buffer(self, buffer_text: str) -> list[float]:
+    def _parse_buffer(self, buffer_text: str) -> np.ndarray:
         if not buffer_text:
-            return []
-        values: list[float] = []
-        for token in buffer_text.replace("\n", ",").split(","):
-            token = token.strip()
-            if not token:
-                continue
-            try:
-                values.append(float(token))
-            except ValueError:
-                continue
-        return values
-
-    def _update_plot(self, voltages: list[float]) -> None:
-        self.ax.clear()
-        self.ax.set_xlabel("Sample")
-        self.ax.set_ylabel("Voltage (V)")
-        self.ax.grid(True, linestyle="--", alpha=0.6)
-        if voltages:
-            x_vals = list(range(1, len(voltages) + 1))
-            self.ax.plot(
-                x_vals,
-                voltages,
-                marker="o",
-                markersize=5,
-                linewidth=1.5,
-                color="tab:blue",
-            )
-            self.ax.fill_between(x_vals, voltages, color="tab:blue", alpha=0.1)
-            self.ax.set_xlim(0.5, len(voltages) + 0.5)
-        self.ax.set_title("Measured Voltages")
-        self.canvas.draw_idle()
+            return np.empty(0, dtype=np.float64)
+        # Commas become whitespace so empty fields and line breaks collapse into one separator.
+        return np.fromstring(buffer_text.replace(",", " "), sep=" ", dtype=np.float64)
+
+    def _on_draw(self, _event) -> None:
+        self._bg = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_line()
+
+    def _store_voltages(self, voltages: np.ndarray) -> None:
+        count = voltages.size
+        if count > self._y.size:
+            capacity = self._y.size
+            while capacity < count:
+                capacity *= 2
+            self._x = np.arange(1, capacity + 1, dtype=np.float64)
+            self._y = np.empty(capacity, dtype=np.float64)
+        self._y[:count] = voltages
+        self._n = count
+
+    def _update_plot(self, voltages: np.ndarray) -> None:
+        if not voltages.size:
+            return
+        self._store_voltages(voltages)
+        self.line.set_data(self._x[: self._n], self._y[: self._n])
+        # Bursts of updates coalesce into one draw per PLOT_REDRAW_MS.
+        self._dirty = True
+        if not self._draw_scheduled:
+            self._draw_scheduled = True
+            self.root.after(PLOT_REDRAW_MS, self._maybe_draw)
+
+    def _maybe_draw(self) -> None:
+        self._draw_scheduled = False
+        if not self._dirty:
+            return
+        self._dirty = False
+
+        # Axes, ticks and grid only need re-rendering when the limits move.
+        xlim = (0.5, self._n + 0.5)
+        voltages = self._y[: self._n]
+        low, high = float(voltages.min()), float(voltages.max())
+        y_low, y_high = self.ax.get_ylim()
+        if self.ax.get_xlim() != xlim or low < y_low or high > y_high:
+            margin = (high - low) * 0.05 or abs(high) * 0.05 or 1e-3
+            self.ax.set_xlim(*xlim)
+            self.ax.set_ylim(low - margin, high + margin)
+            # Let the full Agg render run when Tk is idle, merged with any pending resize draw.
+            self.canvas.draw_idle()
+            return
+        self._restore(self._bg)
+        self._draw_line()
+        self._blit(self.ax.bbox)
 
     def on_close(self) -> None:
         try:
-            if self.figure:
-                plt.close(self.figure)
+            if self.canvas:
+                self._tk_canvas.destroy()
         except Exception:
             pass
+        # No pyplot manager holds the figure, so dropping these references frees it.
+        self.canvas = None
+        self.figure = None
         self.disconnect()
         self.root.quit()
         self.root.destroy()
@@ -19,14 +19,20 @@ inst.write("smu.measure.range = 21")
 inst.write("smu.measure.nplc = 1")
 
 currlist = [1E-7, 1E-6, 1E-5, 1E-4, 1E-3, 1E-2]
-voltlist = [None] * len(currlist)
 
-for i, current in enumerate(currlist):
-    inst.write(f"smu.source.level = {current}")
-    inst.write("smu.source.output = smu.ON")
-    # Query directly; smu.measure.read() returns a value immediately
-    voltlist[i] = float(inst.query("print(smu.measure.read())"))
-    inst.write("smu.source.output = smu.OFF")
+# Run the whole sweep on the instrument, then pull every reading with one query
+levels = ", ".join(str(current) for current in currlist)
+inst.write(f"""loadscript SweepI
+defbuffer1.clear()
+for _, current in ipairs({{{levels}}}) do
+    smu.source.level = current
+    smu.source.output = smu.ON
+    smu.measure.read(defbuffer1)
+    smu.source.output = smu.OFF
+end
+endscript
+SweepI()""")
+voltlist = [float(v) for v in inst.query("printbuffer(1, defbuffer1.n, defbuffer1)").split(",")]
 
 voltDiff = max(voltlist) - min(voltlist)
 print(voltDiff)
\ No newline at end of file
@@ -11,18 +11,31 @@ application window for side-by-side operation.
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import heapq
+import itertools
 import math
 import pathlib
+import queue
+import re
+import socket
 import threading
+import time
 import tkinter as tk
+from collections import deque
 from tkinter import messagebox, scrolledtext, ttk
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
 
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import numpy as np
 import pyvisa
 from pyvisa import constants as visa_constants
 from pyvisa.resources import MessageBasedResource
 
+if TYPE_CHECKING:
+	from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+	from matplotlib.figure import Figure
+
 
 # ---------------------------------------------------------------------------
 # Shared constants / paths
@@ -33,7 +46,21 @@ TSP_SOURCE = ROOT / "2450" / "2450_triggered_different_measure_voltage.tsp"
 SCRIPT_NAME = "FastExternalTrigger"
 DEFAULT_2450_ADDRESS = "TCPIP0::169.254.188.69::5025::SOCKET"
 EDGE_CHOICES = ("rising", "falling", "either")
-READ_DRAIN_TIMEOUT_MS = 750
+# Printed after each run so the reply is framed and the read ends without a timeout.
+RUN_END_SENTINEL = "#END"
+READ_CHUNK_SIZE = 64 * 1024
+_COMMA_TO_SPACE = str.maketrans(",", " ")
+# An instrument error line, or the "Reading Index / Voltage" header that precedes the samples.
+_HEADER_RE = re.compile(r"^\s*(?P<error>error)|reading.*voltage|voltage.*reading", re.IGNORECASE)
+# Upper bound on 2450 plot redraws; faster result bursts coalesce into the latest capture.
+DEFAULT_MAX_REDRAW_HZ = 30
+# Captures longer than this are reduced with LTTB before plotting; the plot is only ~1000 px wide.
+PLOT_MAX_POINTS = 2000
+# How long closing the window waits for queued instrument I/O (outputs off, close).
+IO_SHUTDOWN_TIMEOUT_S = 5.0
+# Per-operation VISA timeouts: status polls fail fast, the configure handshake may take longer.
+STATUS_QUERY_TIMEOUT_MS = 500
+CONFIGURE_WAIT_TIMEOUT_MS = 2000
 
 DEFAULT_KEYSIGHT_ADDRESS = "TCPIP0::169.254.5.22::5025::SOCKET"
 DEFAULT_CH1_FREQ = "1000"
@@ -45,6 +72,112 @@ DEFAULT_CH1_PHASE = "0"
 DEFAULT_CH1_LEAD = ""
 DEFAULT_CH1_TRAIL = ""
 DEFAULT_CH1_EDGE_MODE = "Both"
+CH1_ARM_COMMAND = ":OUTP1 ON;:INIT1:IMM"
+CH2_FIRE_COMMAND = ":INIT2:IMM;*TRG"
+# Channel 1 status as one compound query; the edge-time variant is retried without
+# the transition queries on firmware that rejects them.
+CH1_STATUS_QUERY = ";".join(
+	(
+		":SOUR1:FUNC?",
+		":SOUR1:PULS:PER?",
+		":SOUR1:PULS:WIDTh?",
+		":SOUR1:VOLT:HIGH?",
+		":SOUR1:VOLT:LOW?",
+		":SOUR1:PULS:TRANsition:LEADing?",
+		":SOUR1:PULS:TRANsition:TRAiling?",
+		":OUTP1:LOAD?",
+		":OUTP1?",
+	)
+)
+CH1_STATUS_QUERY_NO_EDGES = ";".join(
+	(
+		":SOUR1:FUNC?",
+		":SOUR1:PULS:PER?",
+		":SOUR1:PULS:WIDTh?",
+		":SOUR1:VOLT:HIGH?",
+		":SOUR1:VOLT:LOW?",
+		":OUTP1:LOAD?",
+		":OUTP1?",
+	)
+)
+
+
+# Ordered so two-letter suffixes are tried before the bare "s".
+_TIME_UNITS: tuple[tuple[str, float], ...] = (
+	("ms", 1e-3),
+	("us", 1e-6),
+	("\u00b5s", 1e-6),
+	("ns", 1e-9),
+	("ps", 1e-12),
+	("s", 1.0),
+)
+_TIME_UNIT_SUFFIXES = tuple(suffix for suffix, _ in _TIME_UNITS)
+
+
+@functools.lru_cache(maxsize=64)
+def _time_text_to_seconds(raw: str) -> float:
+	if raw.endswith(_TIME_UNIT_SUFFIXES):
+		for suffix, scale in _TIME_UNITS:
+			if raw.endswith(suffix):
+				return float(raw[: -len(suffix)]) * scale
+	return float(raw)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_tsp_source() -> bytes:
+	"""Return the 2450 script body; read once, so reconnects skip the file system."""
+	return TSP_SOURCE.read_bytes().strip()
+
+
+_RM_SINGLETON: pyvisa.ResourceManager | None = None
+_RM_LOCK = threading.Lock()
+
+
+def _get_rm() -> pyvisa.ResourceManager:
+	"""Return the process-wide ResourceManager shared by both panels."""
+	global _RM_SINGLETON
+	with _RM_LOCK:
+		if _RM_SINGLETON is None:
+			_RM_SINGLETON = pyvisa.ResourceManager()
+		return _RM_SINGLETON
+
+
+def _enable_tcp_nodelay(inst: MessageBasedResource) -> None:
+	"""Turn off Nagle on a SOCKET session so short SCPI writes leave immediately."""
+	try:
+		inst.set_visa_attribute(visa_constants.ResourceAttribute.tcpip_nodelay, visa_constants.VI_TRUE)
+		return
+	except (pyvisa.VisaIOError, NotImplementedError, AttributeError):
+		pass
+	# pyvisa-py without attribute support: set the option on its socket directly.
+	try:
+		sock = inst.visalib.sessions[inst.session].interface
+		sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+	except (AttributeError, KeyError, OSError, TypeError):
+		pass
+
+
+def _lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> tuple[np.ndarray, np.ndarray]:
+	"""Largest-Triangle-Three-Buckets downsampling to ``threshold`` points, keeping both ends."""
+	n = x.size
+	if threshold < 3 or n <= threshold:
+		return x, y
+	# Interior points 1..n-2 split into threshold-2 buckets; one point is kept per bucket.
+	edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+	keep = np.empty(threshold, dtype=np.intp)
+	keep[0], keep[-1] = 0, n - 1
+	prev = 0
+	for i in range(threshold - 2):
+		lo, hi = edges[i], edges[i + 1]
+		if i + 2 < edges.size:
+			avg_x, avg_y = x[hi:edges[i + 2]].mean(), y[hi:edges[i + 2]].mean()
+		else:
+			avg_x, avg_y = x[-1], y[-1]
+		px, py = x[prev], y[prev]
+		area = np.abs((px - avg_x) * (y[lo:hi] - py) - (px - x[lo:hi]) * (avg_y - py))
+		prev = lo + int(area.argmax())
+		keep[i + 1] = prev
+	return x[keep], y[keep]
 
 
 # ---------------------------------------------------------------------------
@@ -55,6 +188,28 @@ DEFAULT_CH1_EDGE_MODE = "Both"
 class KeysightPulsePanel:
 	"""Encapsulates the channel 2 burst controls plus channel 1 sync helper."""
 
+	# (key, label, parser suffix, Tk variable) for the one-pass field validation.
+	_CH2_FIELD_SPECS = (
+		("freq", "Frequency", "positive", "freq_var"),
+		("vpp", "Amplitude", "positive", "vpp_var"),
+		("cycles", "Burst cycles", "int", "cycles_var"),
+		("settle", "Settle factor", "positive", "settle_var"),
+	)
+	_CH1_FIELD_SPECS = (
+		("freq", "Channel 1 frequency", "positive", "ch1_freq_var"),
+		("width", "Pulse width", "time_to_seconds", "ch1_width_var"),
+		("high", "High level", "float", "ch1_high_var"),
+		("low", "Low level", "float", "ch1_low_var"),
+		("phase", "Phase", "float", "ch1_phase_var"),
+	)
+	# (threshold, multiplier, unit), largest first; anything smaller falls through to ps.
+	_SI_SCALES = (
+		(1.0, 1.0, "s"),
+		(1e-3, 1e3, "ms"),
+		(1e-6, 1e6, "us"),
+		(1e-9, 1e9, "ns"),
+	)
+
 	def __init__(self, parent: tk.Misc) -> None:
 		self.parent = parent
 		self.rm: pyvisa.ResourceManager | None = None
@@ -65,6 +220,15 @@ class KeysightPulsePanel:
 		self.ch1_output_on = False
 		self.ch1_configured = False
 
+		# All VISA I/O runs on one worker thread, in submission order.
+		self._io_q: queue.Queue[Callable[[], None] | None] = queue.Queue()
+		self._closing = False
+		# (deadline, seq, job) heap of timed jobs; only the worker thread touches it.
+		self._deferred: list[tuple[float, int, Callable[[], None]]] = []
+		self._deferred_seq = itertools.count()
+		self._io_thread = threading.Thread(target=self._io_loop, daemon=True)
+		self._io_thread.start()
+
 		self.addr_var = tk.StringVar(value=DEFAULT_KEYSIGHT_ADDRESS)
 		self.freq_var = tk.StringVar(value="1000")
 		self.vpp_var = tk.StringVar(value="4.2")
@@ -83,17 +247,15 @@ class KeysightPulsePanel:
 		self.ch1_edge_mode_var = tk.StringVar(value=DEFAULT_CH1_EDGE_MODE)
 		self.ch1_period_hint_var = tk.StringVar(value="Period: —")
 		self.ch1_burst_var = tk.StringVar(value="1")
+		self._last_hint: str | None = None
+		self._last_ch1_hint: str | None = None
 
 		self._build_ui(parent)
-		try:
-			self.freq_var.trace_add("write", lambda *_: self._update_hint())
-		except AttributeError:
-			self.freq_var.trace("w", lambda *_: self._update_hint())
+		# Refresh the period hints when an entry is committed, not on every keystroke.
+		for sequence in ("<FocusOut>", "<Return>"):
+			self.freq_entry.bind(sequence, lambda _e: self._update_hint())
+			self.ch1_freq_entry.bind(sequence, lambda _e: self._update_ch1_period_hint())
 		self._update_hint()
-		try:
-			self.ch1_freq_var.trace_add("write", lambda *_: self._update_ch1_period_hint())
-		except AttributeError:
-			self.ch1_freq_var.trace("w", lambda *_: self._update_ch1_period_hint())
 		self._update_ch1_period_hint()
 
 	def _build_ui(self, frame: tk.Misc) -> None:
@@ -118,7 +280,8 @@ class KeysightPulsePanel:
 			cfg.columnconfigure(col, weight=1)
 
 		ttk.Label(cfg, text="Frequency (Hz)").grid(column=0, row=0, sticky="e")
-		ttk.Entry(cfg, textvariable=self.freq_var, width=12).grid(column=1, row=0, sticky="w")
+		self.freq_entry = ttk.Entry(cfg, textvariable=self.freq_var, width=12)
+		self.freq_entry.grid(column=1, row=0, sticky="w")
 		ttk.Label(cfg, textvariable=self.pulse_hint_var).grid(column=2, row=0, columnspan=2, sticky="w")
 
 		ttk.Label(cfg, text="Amplitude (Vpp)").grid(column=0, row=1, sticky="e")
@@ -152,7 +315,8 @@ class KeysightPulsePanel:
 		ttk.Label(ch1_frame, text="Frequency (Hz)").grid(column=0, row=0, sticky="e")
 		freq_wrap = ttk.Frame(ch1_frame)
 		freq_wrap.grid(column=1, row=0, sticky="w")
-		ttk.Entry(freq_wrap, textvariable=self.ch1_freq_var, width=12).pack(side=tk.LEFT)
+		self.ch1_freq_entry = ttk.Entry(freq_wrap, textvariable=self.ch1_freq_var, width=12)
+		self.ch1_freq_entry.pack(side=tk.LEFT)
 		ttk.Label(freq_wrap, textvariable=self.ch1_period_hint_var).pack(side=tk.LEFT, padx=(6, 0))
 
 		ttk.Label(ch1_frame, text="Pulse width (s or SI)").grid(column=2, row=0, sticky="e")
@@ -213,10 +377,22 @@ class KeysightPulsePanel:
 		self.log.grid(column=0, row=5, columnspan=2, sticky="nsew", pady=(10, 0))
 		container.rowconfigure(5, weight=1)
 
+	@staticmethod
+	def _set_states(pairs: list[tuple[ttk.Widget, str, str | None]]) -> None:
+		"""Apply each (widget, state, text) in one pass; text None leaves the label alone."""
+		for widget, state, text in pairs:
+			if text is None:
+				widget.configure(state=state)
+			else:
+				widget.configure(state=state, text=text)
+
 	def _log(self, *parts: object) -> None:
-		msg = " ".join(str(p) for p in parts)
+		self._log_many((" ".join(str(p) for p in parts),))
+
+	def _log_many(self, lines: Iterable[str]) -> None:
+		"""Append several lines with a single state toggle and insert."""
 		self.log.configure(state=tk.NORMAL)
-		self.log.insert(tk.END, msg + "\n")
+		self.log.insert(tk.END, "\n".join(lines) + "\n")
 		self.log.see(tk.END)
 		self.log.configure(state=tk.DISABLED)
 
@@ -225,43 +401,32 @@ class KeysightPulsePanel:
 		try:
 			freq = float(txt)
 		except ValueError:
-			self.pulse_hint_var.set("")
-			return
-		if freq <= 0:
-			self.pulse_hint_var.set("")
-			return
-		period = 1.0 / freq
-		self.pulse_hint_var.set(f"Period ≈ {period*1e3:.3f} ms")
+			freq = 0.0
+		hint = f"Period ≈ {1.0 / freq * 1e3:.3f} ms" if freq > 0 else ""
+		# Skip the Tk variable write when nothing changed.
+		if hint != self._last_hint:
+			self._last_hint = hint
+			self.pulse_hint_var.set(hint)
 
 	def _update_ch1_period_hint(self) -> None:
 		txt = self.ch1_freq_var.get().strip()
-		if not txt:
-			self.ch1_period_hint_var.set("Period: —")
-			return
 		try:
-			freq = float(txt)
+			freq = float(txt) if txt else 0.0
 		except ValueError:
-			self.ch1_period_hint_var.set("Period: —")
-			return
-		if freq <= 0:
-			self.ch1_period_hint_var.set("Period: —")
-			return
-		period = 1.0 / freq
-		self.ch1_period_hint_var.set(f"Period ≈ {self._format_seconds_si(period)}")
+			freq = 0.0
+		hint = f"Period ≈ {self._format_seconds_si(1.0 / freq)}" if freq > 0 else "Period: —"
+		if hint != self._last_ch1_hint:
+			self._last_ch1_hint = hint
+			self.ch1_period_hint_var.set(hint)
 
-	@staticmethod
-	def _format_seconds_si(seconds: float) -> str:
+	@classmethod
+	def _format_seconds_si(cls, seconds: float) -> str:
 		value = float(seconds)
-		if value <= 0 or not math.isfinite(value):
+		if not (0 < value < math.inf):
 			return "—"
-		if value >= 1:
-			return f"{value:g} s"
-		if value >= 1e-3:
-			return f"{value*1e3:g} ms"
-		if value >= 1e-6:
-			return f"{value*1e6:g} us"
-		if value >= 1e-9:
-			return f"{value*1e9:g} ns"
+		for threshold, mult, unit in cls._SI_SCALES:
+			if value >= threshold:
+				return f"{value*mult:g} {unit}"
 		return f"{value*1e12:g} ps"
 
 	@staticmethod
@@ -269,19 +434,30 @@ class KeysightPulsePanel:
 		raw = text.strip().lower().replace(" ", "")
 		if not raw:
 			raise ValueError(f"{field_name} is required.")
-		units = {
-			"s": 1.0,
-			"ms": 1e-3,
-			"us": 1e-6,
-			"\u00b5s": 1e-6,
-			"ns": 1e-9,
-			"ps": 1e-12,
-		}
-		for suffix in sorted(units, key=len, reverse=True):
-			if raw.endswith(suffix):
-				number = float(raw[: -len(suffix)])
-				return number * units[suffix]
-		return float(raw)
+		return _time_text_to_seconds(raw)
+
+	@classmethod
+	@functools.lru_cache(maxsize=32)
+	def _build_edge_cmds(cls, mode: str, lead_txt: str, trail_txt: str) -> tuple[str, ...]:
+		"""Return the Channel 1 edge-time commands for the given mode and entries."""
+		if mode == "separate":
+			pairs = []
+			if lead_txt:
+				pairs.append(("LEADing", cls._parse_time_to_seconds(lead_txt, field_name="Lead edge"), "Lead edge"))
+			if trail_txt:
+				pairs.append(("TRAiling", cls._parse_time_to_seconds(trail_txt, field_name="Trail edge"), "Trail edge"))
+		else:
+			if lead_txt and trail_txt and lead_txt != trail_txt:
+				raise ValueError("In 'Both' mode, lead and trail entries must match (or leave blank).")
+			shared_txt = lead_txt or trail_txt
+			if not shared_txt:
+				return ()
+			edge_val = cls._parse_time_to_seconds(shared_txt, field_name="Edge time")
+			pairs = [("LEADing", edge_val, "Edge time"), ("TRAiling", edge_val, "Edge time")]
+		for _, value, label in pairs:
+			if value < 0:
+				raise ValueError(f"{label} must be >= 0.")
+		return tuple(f":SOUR1:PULS:TRANsition:{edge} {value}" for edge, value, _ in pairs)
 
 	@staticmethod
 	def _parse_float(text: str, *, field_name: str) -> float:
@@ -307,52 +483,143 @@ class KeysightPulsePanel:
 			raise ValueError(f"{field_name} must be > 0.")
 		return value
 
-	def _set_ch1_load(self, load_text: str) -> None:
-		if not self.inst:
+	def _parse_fields(self, specs: tuple[tuple[str, str, str, str], ...]) -> tuple[dict[str, float], list[str]]:
+		"""Parse every field in one pass, collecting all errors instead of stopping at the first."""
+		values: dict[str, float] = {}
+		errors: list[str] = []
+		for key, label, kind, var_name in specs:
+			parse = getattr(self, f"_parse_{kind}")
+			try:
+				values[key] = parse(getattr(self, var_name).get(), field_name=label)
+			except ValueError as exc:
+				errors.append(str(exc))
+		return values, errors
+
+	def _io_loop(self) -> None:
+		while True:
+			while self._deferred and self._deferred[0][0] <= time.monotonic():
+				deferred = heapq.heappop(self._deferred)[2]
+				try:
+					deferred()
+				except Exception as exc:
+					# This is the only I/O worker; a stray error must not end it.
+					self._post(self._log, "Deferred I/O failed:", exc)
+			timeout = max(0.0, self._deferred[0][0] - time.monotonic()) if self._deferred else None
+			try:
+				job = self._io_q.get(timeout=timeout)
+			except queue.Empty:
+				continue
+			if job is None:
+				return
+			job()
+
+	def _defer(self, delay_s: float, job: Callable[[], None]) -> None:
+		"""Run ``job`` on the I/O worker after ``delay_s``; call from the worker only."""
+		heapq.heappush(self._deferred, (time.monotonic() + delay_s, next(self._deferred_seq), job))
+
+	def _post(self, callback: Callable[..., object], *args: object) -> None:
+		"""Run ``callback`` on the Tk thread; safe to call from the I/O worker."""
+		if self._closing:
+			# shutdown() joins the worker on the Tk thread; posting would block on it.
+			return
+		try:
+			self.parent.after(0, callback, *args)
+		except (RuntimeError, tk.TclError):
+			pass
+
+	def _submit(
+		self,
+		io: Callable[[MessageBasedResource | None], object],
+		on_done: Callable[[object], None] | None = None,
+		on_error: Callable[[Exception], None] | None = None,
+	) -> None:
+		"""Queue ``io`` for the I/O worker with the current session bound.
+
+		``on_done``/``on_error`` are posted back to the Tk thread. Jobs run in
+		submission order, so a disconnect queued after a write still sees it land.
+		"""
+		inst = self.inst
+
+		def job() -> None:
+			try:
+				result = io(inst)
+			except Exception as exc:
+				if on_error is not None:
+					self._post(on_error, exc)
+				return
+			if on_done is not None:
+				self._post(on_done, result)
+
+		self._io_q.put(job)
+
+	@staticmethod
+	def _write_batch(inst: MessageBasedResource | None, cmds: list[str]) -> None:
+		"""Send several SCPI commands as one compound message."""
+		if not inst:
 			raise RuntimeError("Instrument not connected.")
+		inst.write(";".join(cmds))
+
+	@staticmethod
+	@contextlib.contextmanager
+	def _with_timeout(inst: MessageBasedResource, ms: int) -> Iterator[None]:
+		"""Temporarily override the session timeout for one operation."""
+		previous = inst.timeout
+		inst.timeout = ms
+		try:
+			yield
+		finally:
+			inst.timeout = previous
+
+	@staticmethod
+	def _ch1_load_command(load_text: str) -> str:
 		load = load_text.strip().upper()
 		if load in {"INF", "INFINITE", "HIGHZ", "HZ"}:
-			self.inst.write(":OUTP1:LOAD INF")
-			return
+			return ":OUTP1:LOAD INF"
 		try:
 			value = float(load)
 		except ValueError as exc:
 			raise ValueError("Channel 1 load must be INF or numeric.") from exc
 		if value <= 0:
 			raise ValueError("Channel 1 load must be greater than 0 Ω.")
-		self.inst.write(f":OUTP1:LOAD {value}")
+		return f":OUTP1:LOAD {value}"
 
 	def _update_ch1_button_label(self) -> None:
 		label = "Ch1 Output ON" if self.ch1_output_on else "Ch1 Output OFF"
 		self.btn_ch1_toggle.configure(text=label)
 
+	@staticmethod
+	def _arm_ch1(inst: MessageBasedResource | None) -> None:
+		if not inst:
+			raise RuntimeError("Instrument not connected.")
+		inst.write(CH1_ARM_COMMAND)
+
+	def _on_ch1_armed(self, _result: object = None) -> None:
+		self.ch1_output_on = True
+		self._update_ch1_button_label()
+		self._log("Channel 1 armed and awaiting BUS trigger.")
+
 	def _ensure_ch1_output_on(self) -> None:
 		if not self.inst or not self.ch1_configured:
 			return
-		self.inst.write(":OUTP1 ON")
-		self.inst.write(":INIT1:IMM")
-		if not self.ch1_output_on:
-			self.ch1_output_on = True
-		self._update_ch1_button_label()
-		self._log("Channel 1 armed and awaiting BUS trigger.")
+		self._submit(self._arm_ch1, self._on_ch1_armed, lambda exc: self._log("Channel 1 arm failed:", exc))
 
 	def start_ch1_for_trigger(self) -> None:
 		if not self.inst or not self.connected:
 			raise RuntimeError("Connect the Keysight 33522B first.")
 		if not self.ch1_configured:
 			raise RuntimeError("Configure Channel 1 before arming the trigger.")
-		self.inst.write(":OUTP1 ON")
-		self.ch1_output_on = True
-		self._update_ch1_button_label()
-		self._log("Channel 1 output forced ON for trigger synchronisation.")
+
+		def done(_: object) -> None:
+			self.ch1_output_on = True
+			self._update_ch1_button_label()
+			self._log("Channel 1 output forced ON for trigger synchronisation.")
+
+		self._submit(lambda inst: inst.write(":OUTP1 ON"), done, lambda exc: self._log("Channel 1 ON failed:", exc))
 
 	def force_ch1_off(self) -> None:
 		if not self.inst:
 			return
-		try:
-			self.inst.write(":OUTP1 OFF")
-		except Exception:
-			pass
+		self._submit(lambda inst: inst.write(":OUTP1 OFF"))
 		was_on = self.ch1_output_on
 		self.ch1_output_on = False
 		self._update_ch1_button_label()
@@ -362,10 +629,7 @@ class KeysightPulsePanel:
 	def shutdown_outputs(self) -> None:
 		if not self.inst:
 			return
-		try:
-			self.inst.write(":OUTP2 OFF")
-		except Exception:
-			pass
+		self._submit(lambda inst: inst.write(":OUTP2 OFF"))
 		self.force_ch1_off()
 		self.output_on = False
 		self.ch1_output_on = False
@@ -379,188 +643,194 @@ class KeysightPulsePanel:
 		if not addr:
 			messagebox.showerror("Keysight", "Provide a VISA address.")
 			return
-		try:
-			if self.rm is None:
-				self.rm = pyvisa.ResourceManager()
-			self.inst = self.rm.open_resource(addr, timeout=5000)
-			self.inst.write_termination = "\n"
-			self.inst.read_termination = "\n"
-			idn = self.inst.query("*IDN?").strip()
-			self._log("Connected:", idn)
-			self.connected = True
-			self.btn_connect.configure(state="disabled")
-			self.btn_disconnect.configure(state="normal")
-			self.btn_configure.configure(state="normal")
-			self.btn_ch1_configure.configure(state="normal")
-			self.btn_ch1_query.configure(state="normal")
-			self.btn_ch1_toggle.configure(state="disabled")
-		except Exception as exc:
-			self._log("Connect failed:", exc)
-			messagebox.showerror("Keysight", str(exc))
+		self.btn_connect.configure(state="disabled")
+
+		def io(_: object) -> tuple[pyvisa.ResourceManager, MessageBasedResource, str]:
+			manager = _get_rm()
+			inst = manager.open_resource(addr, timeout=5000)
+			_enable_tcp_nodelay(inst)
+			try:
+				inst.write_termination = "\n"
+				inst.read_termination = "\n"
+				idn = inst.query("*IDN?").strip()
+			except Exception:
+				inst.close()
+				raise
+			return manager, inst, idn
+
+		self._submit(io, self._on_connected, self._on_connect_failed)
+
+	def _on_connected(self, result: object) -> None:
+		self.rm, self.inst, idn = result
+		self._log("Connected:", idn)
+		self.connected = True
+		self._set_states([
+			(self.btn_connect, "disabled", None),
+			(self.btn_disconnect, "normal", None),
+			(self.btn_configure, "normal", None),
+			(self.btn_ch1_configure, "normal", None),
+			(self.btn_ch1_query, "normal", None),
+			(self.btn_ch1_toggle, "disabled", None),
+		])
+
+	def _on_connect_failed(self, exc: Exception) -> None:
+		self.btn_connect.configure(state="normal")
+		self._log("Connect failed:", exc)
+		messagebox.showerror("Keysight", str(exc))
 
 	def disconnect(self) -> None:
 		if not self.connected:
 			return
-		try:
-			self.stop()
-		except Exception:
-			pass
-		try:
-			self.shutdown_outputs()
-		except Exception:
-			pass
-		if self.inst:
-			try:
-				self.inst.close()
-			except Exception:
-				pass
+		self.stop()
+		self.shutdown_outputs()
+
+		def io(inst: MessageBasedResource | None) -> None:
+			# Only the session is closed; the shared ResourceManager stays open for reconnects.
+			if inst:
+				try:
+					inst.close()
+				except Exception:
+					pass
+
+		self._submit(io, lambda _: self._log("Disconnected."))
 		self.inst = None
-		if self.rm:
-			try:
-				self.rm.close()
-			except Exception:
-				pass
-		self.rm = None
 		self.connected = False
 		self.configured = False
 		self.output_on = False
 		self.ch1_output_on = False
 		self.ch1_configured = False
-		self.btn_connect.configure(state="normal")
-		self.btn_disconnect.configure(state="disabled")
-		self.btn_configure.configure(state="disabled")
-		self.btn_fire.configure(state="disabled")
-		self.btn_stop.configure(state="disabled")
-		self.btn_toggle.configure(state="disabled", text="Ch2 Output OFF")
-		self.btn_ch1_configure.configure(state="disabled")
-		self.btn_ch1_toggle.configure(state="disabled", text="Ch1 Output OFF")
-		self.btn_ch1_query.configure(state="disabled")
-		self._log("Disconnected.")
+		self._set_states([
+			(self.btn_connect, "normal", None),
+			(self.btn_disconnect, "disabled", None),
+			(self.btn_configure, "disabled", None),
+			(self.btn_fire, "disabled", None),
+			(self.btn_stop, "disabled", None),
+			(self.btn_toggle, "disabled", "Ch2 Output OFF"),
+			(self.btn_ch1_configure, "disabled", None),
+			(self.btn_ch1_toggle, "disabled", "Ch1 Output OFF"),
+			(self.btn_ch1_query, "disabled", None),
+		])
 
 	def configure(self) -> None:
 		if not self.connected or not self.inst:
 			messagebox.showwarning("Keysight", "Connect first.")
 			return
-		try:
-			freq = float(self.freq_var.get())
-			vpp = float(self.vpp_var.get())
-			cycles = int(float(self.cycles_var.get()))
-			settle = float(self.settle_var.get())
-		except ValueError:
-			messagebox.showerror("Keysight", "Enter numeric settings.")
-			return
-		if freq <= 0 or vpp <= 0 or cycles <= 0 or settle <= 0:
-			messagebox.showerror("Keysight", "Values must be positive.")
+		values, errors = self._parse_fields(self._CH2_FIELD_SPECS)
+		if values.get("vpp", 0.0) > 10:
+			errors.append("Amplitude limited to 10 Vpp.")
+		if errors:
+			messagebox.showerror("Keysight", "\n".join(errors))
 			return
-		if vpp > 10:
-			messagebox.showerror("Keysight", "Amplitude limited to 10 Vpp.")
-			return
-		try:
-			self.inst.write("*CLS")
-			self.inst.write(":SOUR2:FUNC SQU")
-			self.inst.write(f":SOUR2:FREQ {freq}")
-			self.inst.write(":SOUR2:VOLT:LOW 0")
-			self.inst.write(f":SOUR2:VOLT:HIGH {vpp}")
-			self.inst.write(f":SOUR2:VOLT:OFFS {vpp/2.0}")
-			self.inst.write(":SOUR2:PULS:DCYC 50")
-			self.inst.write(":OUTP2:LOAD INF")
-			self.inst.write(":SOUR2:BURSt:STAT ON")
-			self.inst.write(":SOUR2:BURSt:MODE TRIG")
-			self.inst.write(f":SOUR2:BURSt:NCYC {cycles}")
-			self.inst.write(":TRIG2:SOUR BUS")
-			self.inst.write(":INIT2:CONT OFF")
-			self.inst.write(":OUTP2 ON")
-			self.output_on = True
-			self.btn_toggle.configure(text="Ch2 Output ON")
+		freq = values["freq"]
+		vpp = values["vpp"]
+		cycles = int(values["cycles"])
+		cmds = [
+			"*CLS",
+			# Function, frequency, amplitude and offset (0 V low, vpp high) in one header.
+			f":SOUR2:APPL:SQU {freq},{vpp},{vpp/2.0}",
+			":SOUR2:PULS:DCYC 50",
+			":OUTP2:LOAD INF",
+			":SOUR2:BURSt:STAT ON",
+			":SOUR2:BURSt:MODE TRIG",
+			f":SOUR2:BURSt:NCYC {cycles}",
+			":TRIG2:SOUR BUS",
+			":INIT2:CONT OFF",
+			":OUTP2 ON",
+		]
+
+		def done(_: object) -> None:
 			self.configured = True
 			self.output_on = False
-			self.btn_fire.configure(state="normal")
-			self.btn_stop.configure(state="normal")
-			self.btn_toggle.configure(state="normal", text="Ch2 Output OFF")
+			self._set_states([
+				(self.btn_fire, "normal", None),
+				(self.btn_stop, "normal", None),
+				(self.btn_toggle, "normal", "Ch2 Output OFF"),
+			])
 			self._log(
 				f"Ch2 configured: {freq} Hz, {vpp} Vpp, {cycles} cycle(s) per bus trigger."
 			)
-			auto_ok = self.configure_ch1(silent=True)
-			if auto_ok:
-				try:
-					self._ensure_ch1_output_on()
-				except Exception:
-					pass
-				self._log("Channel 1 auto-configured and output ON.")
-		except Exception as exc:
+			self.configure_ch1(silent=True)
+
+		def failed(exc: Exception) -> None:
 			self._log("Configure failed:", exc)
 			messagebox.showerror("Keysight", str(exc))
 
+		self._submit(lambda inst: self._write_batch(inst, cmds), done, failed)
+
 	def configure_ch1(self, *, silent: bool = False) -> bool:
+		"""Validate the Channel 1 fields and queue the setup; False on bad input."""
 		if not self.connected or not self.inst:
 			if not silent:
 				messagebox.showwarning("Channel 1", "Connect first.")
 			return False
+		values, errors = self._parse_fields(self._CH1_FIELD_SPECS)
+		freq = values.get("freq")
+		width = values.get("width")
+		high_level = values.get("high")
+		low_level = values.get("low")
+		phase = values.get("phase")
+		lead_txt = self.ch1_lead_var.get().strip()
+		trail_txt = self.ch1_trail_var.get().strip()
+		mode = self.ch1_edge_mode_var.get().strip().lower() or "both"
+
+		period = 1.0 / freq if freq else 0.0
+		if freq and width is not None and not (0 < width < period):
+			errors.append("Pulse width must be greater than 0 and less than the period.")
+		if high_level is not None and low_level is not None and high_level <= low_level:
+			errors.append("High level must be greater than low level.")
+
 		try:
-			freq = self._parse_positive(self.ch1_freq_var.get(), field_name="Channel 1 frequency")
-			width = self._parse_time_to_seconds(self.ch1_width_var.get(), field_name="Pulse width")
-			high_level = self._parse_float(self.ch1_high_var.get(), field_name="High level")
-			low_level = self._parse_float(self.ch1_low_var.get(), field_name="Low level")
-			load_text = self.ch1_load_var.get()
-			phase = self._parse_float(self.ch1_phase_var.get(), field_name="Phase")
-			lead_txt = self.ch1_lead_var.get().strip()
-			trail_txt = self.ch1_trail_var.get().strip()
-			mode = self.ch1_edge_mode_var.get().strip().lower() or "both"
-
-			period = 1.0 / freq
-			if not (0 < width < period):
-				raise ValueError("Pulse width must be greater than 0 and less than the period.")
-			if high_level <= low_level:
-				raise ValueError("High level must be greater than low level.")
+			burst_count = int(float(self.ch1_burst_var.get()))
+		except ValueError:
+			burst_count = 1
+		if burst_count < 1:
+			burst_count = 1
 
-			try:
-				burst_count = int(float(self.ch1_burst_var.get()))
-			except ValueError:
-				burst_count = 1
-			if burst_count < 1:
-				burst_count = 1
-
-			self.inst.write(":OUTP1 OFF")
-			self._set_ch1_load(load_text)
-			self.inst.write(":SOUR1:FUNC PULS")
-			self.inst.write(f":SOUR1:PULS:PER {period}")
-			self.inst.write(f":SOUR1:PULS:WIDTh {width}")
-			high_level = 2.0
-			low_level = 0.0
-			self.inst.write(f":SOUR1:VOLT:HIGH {high_level}")
-			self.inst.write(f":SOUR1:VOLT:LOW {low_level}")
-			self.inst.write(f":SOUR1:PHAS {phase}")
-
-			if mode == "separate":
-				if lead_txt:
-					lead_val = self._parse_time_to_seconds(lead_txt, field_name="Lead edge")
-					if lead_val < 0:
-						raise ValueError("Lead edge must be >= 0.")
-					self.inst.write(f":SOUR1:PULS:TRANsition:LEADing {lead_val}")
-				if trail_txt:
-					trail_val = self._parse_time_to_seconds(trail_txt, field_name="Trail edge")
-					if trail_val < 0:
-						raise ValueError("Trail edge must be >= 0.")
-					self.inst.write(f":SOUR1:PULS:TRANsition:TRAiling {trail_val}")
-			else:
-				if lead_txt and trail_txt and lead_txt != trail_txt:
-					raise ValueError("In 'Both' mode, lead and trail entries must match (or leave blank).")
-				shared_txt = lead_txt or trail_txt
-				if shared_txt:
-					edge_val = self._parse_time_to_seconds(shared_txt, field_name="Edge time")
-					if edge_val < 0:
-						raise ValueError("Edge time must be >= 0.")
-					self.inst.write(f":SOUR1:PULS:TRANsition:LEADing {edge_val}")
-					self.inst.write(f":SOUR1:PULS:TRANsition:TRAiling {edge_val}")
-
-			self.inst.write(":SOUR1:BURSt:STAT ON")
-			self.inst.write(":SOUR1:BURSt:MODE TRIG")
-			self.inst.write(f":SOUR1:BURSt:NCYC {burst_count}")
-			self.inst.write(":TRIG1:SOUR BUS")
-			self.inst.write(":INIT1:CONT OFF")
-			self.inst.write(":OUTP1 OFF")
-
-			self.inst.write("*WAI")
+		load_cmd = ""
+		try:
+			load_cmd = self._ch1_load_command(self.ch1_load_var.get())
+		except ValueError as exc:
+			errors.append(str(exc))
+
+		edge_cmds: tuple[str, ...] = ()
+		try:
+			edge_cmds = self._build_edge_cmds(mode, lead_txt, trail_txt)
+		except ValueError as exc:
+			errors.append(str(exc))
+		if errors:
+			message = "\n".join(errors)
+			self._log("Channel 1 configure error:", message)
+			if not silent:
+				messagebox.showerror("Channel 1", message)
+			return False
+
+		# Output goes OFF once up front; _ensure_ch1_output_on() turns it back ON when done.
+		cmds = [
+			":OUTP1 OFF",
+			load_cmd,
+			":SOUR1:FUNC PULS",
+			f":SOUR1:PULS:PER {period}",
+			f":SOUR1:PULS:WIDTh {width}",
+			f":SOUR1:VOLT:HIGH {high_level}",
+			f":SOUR1:VOLT:LOW {low_level}",
+			f":SOUR1:PHAS {phase}",
+			*edge_cmds,
+			":SOUR1:BURSt:STAT ON",
+			":SOUR1:BURSt:MODE TRIG",
+			f":SOUR1:BURSt:NCYC {burst_count}",
+			":TRIG1:SOUR BUS",
+			":INIT1:CONT OFF",
+			"*OPC?",
+		]
+
+		def io(inst: MessageBasedResource | None) -> None:
+			if not inst:
+				raise RuntimeError("Instrument not connected.")
+			# *OPC? answers once the setup has been applied, so done() runs on a settled channel.
+			with self._with_timeout(inst, CONFIGURE_WAIT_TIMEOUT_MS):
+				inst.query(";".join(cmds))
+
+		def done(_: object) -> None:
 			self.ch1_configured = True
 			self.ch1_output_on = False
 			self._update_ch1_button_label()
@@ -572,30 +842,43 @@ class KeysightPulsePanel:
 			self._log(f"Channel 1 set for BUS-triggered {burst_count}-cycle burst.")
 			if not silent:
 				self._log("Channel 1 pulse configured (output OFF).")
-			try:
-				self._ensure_ch1_output_on()
-			except Exception:
-				pass
-			return True
-		except ValueError as exc:
-			self._log("Channel 1 configure error:", exc)
-			if not silent:
-				messagebox.showerror("Channel 1", str(exc))
-		except Exception as exc:
+			self._ensure_ch1_output_on()
+			if silent:
+				self._log("Channel 1 auto-configured and output ON.")
+
+		def failed(exc: Exception) -> None:
 			self._log("Channel 1 configure failed:", exc)
 			if not silent:
 				messagebox.showerror("Channel 1", str(exc))
-		return False
+
+		self._submit(io, done, failed)
+		return True
+
+	@staticmethod
+	def _write_ch1_trigger_delay(inst: MessageBasedResource | None, seconds: float) -> Exception | None:
+		"""Program the Channel 1 delay; returns the error instead of raising it."""
+		try:
+			if not inst:
+				raise RuntimeError("Instrument not connected.")
+			inst.write(f":TRIG1:DELay {seconds}")
+		except Exception as exc:
+			return exc
+		return None
+
+	def _log_ch1_trigger_delay(self, seconds: float, error: Exception | None) -> None:
+		if error is None:
+			self._log(f"Channel 1 trigger delay set to {seconds:.6f}s relative to Channel 2 trigger.")
+		else:
+			self._log(f"Unable to program Channel 1 trigger delay ({seconds:.6f}s): {error}")
 
 	def _set_ch1_trigger_delay(self, delay_seconds: float) -> None:
 		if not self.inst or not self.ch1_configured:
 			return
 		seconds = max(0.0, float(delay_seconds))
-		try:
-			self.inst.write(f":TRIG1:DELay {seconds}")
-			self._log(f"Channel 1 trigger delay set to {seconds:.6f}s relative to Channel 2 trigger.")
-		except Exception as exc:
-			self._log(f"Unable to program Channel 1 trigger delay ({seconds:.6f}s): {exc}")
+		self._submit(
+			lambda inst: self._write_ch1_trigger_delay(inst, seconds),
+			lambda error: self._log_ch1_trigger_delay(seconds, error),
+		)
 
 	def fire_pulse(self) -> None:
 		if not self.configured or not self.inst:
@@ -622,107 +905,135 @@ class KeysightPulsePanel:
 		else:
 			phase_delay = dwell
 
-		try:
-			if not self.output_on:
-				self.inst.write(":OUTP2 ON")
+		# Snapshot the flags: the whole sequence runs as one job so a failure stops the trigger.
+		ch2_was_on = self.output_on
+		arm_ch1 = self.ch1_configured
+
+		def io(inst: MessageBasedResource | None) -> Exception | None:
+			if not inst:
+				raise RuntimeError("Instrument not connected.")
+			delay_error = None
+			if not ch2_was_on:
+				inst.write(":OUTP2 ON")
+			if arm_ch1:
+				delay_error = self._write_ch1_trigger_delay(inst, phase_delay)
+				# Arm both channels and trigger in one message to keep the TCP gap out of the phase.
+				inst.write(f"{CH1_ARM_COMMAND};{CH2_FIRE_COMMAND}")
+			else:
+				inst.write(CH2_FIRE_COMMAND)
+			# Time the auto-off on the worker's monotonic clock rather than a Tk timer.
+			self._defer(dwell, lambda: self._auto_off_after_fire(inst))
+			return delay_error
+
+		def done(delay_error: Exception | None) -> None:
+			if not ch2_was_on:
 				self.output_on = True
 				self.btn_toggle.configure(text="Ch2 Output ON")
-			if self.ch1_configured:
-				self._set_ch1_trigger_delay(phase_delay)
-				self._ensure_ch1_output_on()
-			else:
-				if phase_delay > 0:
-					self._log("Phase delay ignored because Channel 1 is not configured.")
-
-			def launch_pulse() -> None:
-				self.inst.write(":INIT2:IMM")
-				self.inst.write("*TRG")
-				self._log(
-					f"Burst triggered: {cycles} cycle(s) ({duration*1e3:.3f} ms). Ch1 delay={phase_delay:.6f}s."
-				)
-				self.parent.after(int(dwell * 1000), self._auto_off_after_fire)
+			if arm_ch1:
+				self._log_ch1_trigger_delay(phase_delay, delay_error)
+				self._on_ch1_armed()
+			elif phase_delay > 0:
+				self._log("Phase delay ignored because Channel 1 is not configured.")
+			self._log(
+				f"Burst triggered: {cycles} cycle(s) ({duration*1e3:.3f} ms). Ch1 delay={phase_delay:.6f}s."
+			)
 
-			launch_pulse()
-		except Exception as exc:
+		def failed(exc: Exception) -> None:
 			self._log("Pulse failed:", exc)
 			messagebox.showerror("Keysight", str(exc))
 
-	def _auto_off_after_fire(self) -> None:
-		if self.configured and not self.output_on:
+		self._submit(io, done, failed)
+
+	def _auto_off_after_fire(self, inst: MessageBasedResource) -> None:
+		"""Deferred worker job: switch Channel 2 off once the burst has settled."""
+		if inst is not self.inst:
+			# Disconnected (or reconnected) since the pulse was fired.
 			return
 		try:
-			if self.inst and self.output_on:
-				self.inst.write(":OUTP2 OFF")
-				self.output_on = False
-				self.btn_toggle.configure(text="Ch2 Output OFF")
-				self._log("Channel 2 automatically turned OFF after burst.")
-		except Exception:
-			pass
+			inst.write(":OUTP2 OFF")
+		except Exception as exc:
+			self._post(self._log, "Auto-off failed:", exc)
+			return
+		self._post(self._on_auto_off)
+
+	def _on_auto_off(self) -> None:
+		if not self.output_on:
+			return
+		self.output_on = False
+		self.btn_toggle.configure(text="Ch2 Output OFF")
+		self._log("Channel 2 automatically turned OFF after burst.")
 
 	def stop(self) -> None:
 		if not self.inst:
 			return
-		try:
-			self.inst.write(":OUTP2 OFF")
-			self.inst.write(":SOUR2:BURSt:STAT OFF")
-			self.inst.write(":INIT2:CONT OFF")
+
+		def io(inst: MessageBasedResource | None) -> None:
+			inst.write(":OUTP2 OFF")
+			inst.write(":SOUR2:BURSt:STAT OFF")
+			inst.write(":INIT2:CONT OFF")
+
+		def done(_: object) -> None:
 			self.output_on = False
 			self.btn_toggle.configure(text="Ch2 Output OFF")
 			self._log("Channel 2 output disabled.")
-		except Exception as exc:
-			self._log("Stop failed:", exc)
+
+		self._submit(io, done, lambda exc: self._log("Stop failed:", exc))
 
 	def toggle_output(self) -> None:
 		if not self.inst or not self.configured:
 			return
 		desired = not self.output_on
-		try:
-			self.inst.write(":OUTP2 ON" if desired else ":OUTP2 OFF")
+
+		def done(_: object) -> None:
 			self.output_on = desired
 			label = "Ch2 Output ON" if desired else "Ch2 Output OFF"
 			self.btn_toggle.configure(text=label)
 			self._log(f"Channel 2 output {label.split()[-1]}.")
-		except Exception as exc:
-			self._log("Toggle failed:", exc)
+
+		self._submit(
+			lambda inst: inst.write(":OUTP2 ON" if desired else ":OUTP2 OFF"),
+			done,
+			lambda exc: self._log("Toggle failed:", exc),
+		)
 
 	def toggle_ch1_output(self) -> None:
 		if not self.inst or not self.connected or not self.ch1_configured:
 			return
 		desired = not self.ch1_output_on
-		try:
-			self.inst.write(":OUTP1 ON" if desired else ":OUTP1 OFF")
+
+		def done(_: object) -> None:
 			self.ch1_output_on = desired
 			self._update_ch1_button_label()
 			self._log(f"Channel 1 output {'ON' if desired else 'OFF'}.")
-		except Exception as exc:
+
+		def failed(exc: Exception) -> None:
 			messagebox.showerror("Channel 1", str(exc))
 			self._log("Channel 1 toggle failed:", exc)
 
+		self._submit(lambda inst: inst.write(":OUTP1 ON" if desired else ":OUTP1 OFF"), done, failed)
+
 	def query_ch1_status(self) -> None:
 		if not self.inst or not self.connected:
 			messagebox.showwarning("Channel 1", "Connect first.")
 			return
-		try:
-			def ask(cmd: str) -> str:
-				assert self.inst
-				return self.inst.query(cmd).strip()
-
-			func = ask(":SOUR1:FUNC?")
-			period = ask(":SOUR1:PULS:PER?")
-			width = ask(":SOUR1:PULS:WIDTh?")
-			high = ask(":SOUR1:VOLT:HIGH?")
-			low = ask(":SOUR1:VOLT:LOW?")
-			try:
-				lead = ask(":SOUR1:PULS:TRANsition:LEADing?")
-			except Exception:
-				lead = "(n/a)"
-			try:
-				trail = ask(":SOUR1:PULS:TRANsition:TRAiling?")
-			except Exception:
-				trail = "(n/a)"
-			load = ask(":OUTP1:LOAD?")
-			outp = ask(":OUTP1?")
-			for line in (
+
+		def io(inst: MessageBasedResource | None) -> tuple[str, ...]:
+			assert inst
+			with self._with_timeout(inst, STATUS_QUERY_TIMEOUT_MS):
+				try:
+					parts = [p.strip() for p in inst.query(CH1_STATUS_QUERY).split(";")]
+				except pyvisa.VisaIOError:
+					parts = []
+				if len(parts) == 9:
+					return tuple(parts)
+				func, period, width, high, low, load, outp = (
+					p.strip() for p in inst.query(CH1_STATUS_QUERY_NO_EDGES).split(";")
+				)
+			return func, period, width, high, low, "(n/a)", "(n/a)", load, outp
+
+		def done(result: tuple[str, ...]) -> None:
+			func, period, width, high, low, lead, trail, load, outp = result
+			self._log_many((
 				"Channel 1 status:",
 				f"  Function: {func}",
 				f"  Period: {period} s",
@@ -731,17 +1042,23 @@ class KeysightPulsePanel:
 				f"  Lead: {lead} s  Trail: {trail} s",
 				f"  Load: {load}",
 				f"  Output: {outp}",
-			):
-				self._log(line)
-		except Exception as exc:
+			))
+
+		def failed(exc: Exception) -> None:
 			messagebox.showerror("Channel 1", str(exc))
 			self._log("Channel 1 query failed:", exc)
 
+		self._submit(io, done, failed)
+
 	def shutdown(self) -> None:
 		try:
 			self.disconnect()
 		except Exception:
 			pass
+		# Let the queued output-off and close jobs reach the instrument before exit.
+		self._closing = True
+		self._io_q.put(None)
+		self._io_thread.join(timeout=IO_SHUTDOWN_TIMEOUT_S)
 
 
 # ---------------------------------------------------------------------------
@@ -775,16 +1092,34 @@ class ExternalTriggerPanel:
 
 		self.status_var = tk.StringVar(value="Disconnected")
 		self.result_var = tk.StringVar(value="No run yet")
+		self.max_redraw_hz_var = tk.IntVar(value=DEFAULT_MAX_REDRAW_HZ)
 
 		self.log_widget: scrolledtext.ScrolledText | None = None
-		self.figure: plt.Figure | None = None
+		self._log_queue: deque[str] = deque()
+		self._log_flush_pending = False
+		self.figure: Figure | None = None
 		self.ax = None
 		self.canvas: FigureCanvasTkAgg | None = None
+		# matplotlib is imported when the plot is built, not when the module loads.
+		self._plt = None
+		self._Canvas = None
+		self._line = None
+		self._bg = None
+		self._last_draw_ts = 0.0
+		self._plot_pending = False
+		self._pending_data: tuple[np.ndarray, np.ndarray] = self._empty_capture()
+		self._last_plot_data: tuple[np.ndarray, np.ndarray] | None = None
 		self.btn_run: ttk.Button | None = None
 
-		self.worker: threading.Thread | None = None
 		self.running = False
-		self.latest_data: list[tuple[int, float]] = []
+		# (sample index, voltage) arrays of the last capture.
+		self.latest_data: tuple[np.ndarray, np.ndarray] = self._empty_capture()
+
+		# Connect, script load, runs and close are queued to one I/O worker thread.
+		self._io_q: queue.Queue[Callable[[], None] | None] = queue.Queue()
+		self._closing = False
+		self._io_thread = threading.Thread(target=self._io_loop, daemon=True)
+		self._io_thread.start()
 
 		self._build_ui()
 
@@ -840,6 +1175,9 @@ class ExternalTriggerPanel:
 		ttk.Label(params, text="Result").grid(column=2, row=2, sticky="w", padx=(12, 6), pady=(8, 0))
 		ttk.Label(params, textvariable=self.result_var, foreground="navy").grid(column=3, row=2, sticky="w", pady=(8, 0))
 
+		ttk.Label(params, text="Max redraw (Hz)").grid(column=2, row=3, sticky="w", padx=(12, 6), pady=(8, 0))
+		ttk.Entry(params, textvariable=self.max_redraw_hz_var, width=6).grid(column=3, row=3, sticky="w", pady=(8, 0))
+
 		actions = ttk.Frame(control)
 		actions.grid(column=0, row=2, columnspan=2, sticky="ew", pady=(12, 0))
 		actions.columnconfigure(0, weight=1)
@@ -865,14 +1203,46 @@ class ExternalTriggerPanel:
 		plot_frame.grid(column=0, row=1, sticky="nsew", pady=(8, 0))
 		plot_container.rowconfigure(1, weight=1)
 
-		self.figure, self.ax = plt.subplots(figsize=(5.5, 4))
+		import matplotlib.pyplot as plt
+		from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+		self._plt, self._Canvas = plt, FigureCanvasTkAgg
+		self.figure, self.ax = self._plt.subplots(figsize=(5.5, 4))
 		self.figure.subplots_adjust(left=0.12, right=0.95, bottom=0.15, top=0.92)
 		self.ax.set_xlabel("Sample")
 		self.ax.set_ylabel("Voltage (V)")
 		self.ax.grid(True, linestyle="--", alpha=0.6)
 		self.ax.set_title("Awaiting data")
-		self.canvas = FigureCanvasTkAgg(self.figure, master=plot_frame)
+		# Animated, so full draws leave it out of the cached background used for blitting.
+		(self._line,) = self.ax.plot(
+			[], [], marker="o", markersize=4, linewidth=1.4, color="tab:blue", animated=True
+		)
+		self.canvas = self._Canvas(self.figure, master=plot_frame)
 		self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+		# Every full draw (first show, resize, limit change) recaptures the background.
+		self.canvas.mpl_connect("draw_event", self._on_draw)
+
+	# ------------------------------------------------------------ I/O worker --
+	def _io_loop(self) -> None:
+		while True:
+			job = self._io_q.get()
+			if job is None:
+				return
+			try:
+				job()
+			except Exception as exc:
+				# This is the only 2450 I/O worker; a stray error must not end it.
+				self._post(self._log, f"I/O job failed: {exc}")
+
+	def _post(self, callback: Callable[..., object], *args: object) -> None:
+		"""Run ``callback`` on the Tk thread; safe to call from the I/O worker."""
+		if self._closing:
+			# shutdown() joins the worker on the Tk thread; posting would block on it.
+			return
+		try:
+			self.root.after(0, callback, *args)
+		except (RuntimeError, tk.TclError):
+			pass
 
 	# ------------------------------------------------------------- actions --
 	def connect(self) -> None:
@@ -880,71 +1250,84 @@ class ExternalTriggerPanel:
 		if not address:
 			messagebox.showerror("Connect", "Please provide a VISA resource address.")
 			return
-		try:
-			if self.rm is None:
-				self.rm = pyvisa.ResourceManager()
-			self.inst = self.rm.open_resource(address)
-			self.inst.read_termination = "\n"
-			self.inst.write_termination = "\n"
-			self.inst.timeout = 60000
-			idn = self.inst.query("*IDN?").strip()
-			self.status_var.set(f"Connected: {idn}")
-			self._log(f"Connected to {idn}")
-			self._load_script()
-		except pyvisa.VisaIOError as exc:
-			messagebox.showerror("Connect", f"Failed to connect: {exc}")
-			self._log(f"Connection failed: {exc}")
-			self.inst = None
+
+		def job() -> None:
+			try:
+				manager = _get_rm()
+				inst = manager.open_resource(address)
+				_enable_tcp_nodelay(inst)
+				inst.read_termination = "\n"
+				inst.write_termination = "\n"
+				inst.timeout = 60000
+				inst.chunk_size = READ_CHUNK_SIZE
+				idn = inst.query("*IDN?").strip()
+			except Exception as exc:
+				# ValueError covers a malformed address or a missing VISA backend.
+				self._post(self._on_connect_failed, exc)
+				return
+			self._post(self._on_connected, manager, inst, idn)
+
+		self._io_q.put(job)
+
+	def _on_connected(self, rm: pyvisa.ResourceManager, inst: MessageBasedResource, idn: str) -> None:
+		self.rm = rm
+		self.inst = inst
+		self.status_var.set(f"Connected: {idn}")
+		self._log(f"Connected to {idn}")
+		self._io_q.put(self._load_script)
+		self._update_buttons()
+
+	def _on_connect_failed(self, exc: Exception) -> None:
+		messagebox.showerror("Connect", f"Failed to connect: {exc}")
+		self._log(f"Connection failed: {exc}")
+		self.inst = None
 		self._update_buttons()
 
 	def disconnect(self) -> None:
 		if self.running:
 			self.cancel_measurement()
-		if self.inst is not None:
-			try:
-				self.inst.close()
-			except pyvisa.VisaIOError:
-				pass
-		if self.rm is not None:
-			try:
-				self.rm.close()
-			except pyvisa.VisaIOError:
-				pass
+		inst = self.inst
+
+		def job() -> None:
+			if inst is not None:
+				try:
+					inst.close()
+				except pyvisa.VisaIOError:
+					pass
+
+		self._io_q.put(job)
 		self.inst = None
-		self.rm = None
 		self.script_loaded = False
 		self.status_var.set("Disconnected")
 		self._log("Disconnected.")
 		self._update_buttons()
 
 	def _load_script(self) -> None:
+		"""Upload the TSP script; runs on the I/O worker."""
 		if self.inst is None:
 			return
 		if not TSP_SOURCE.exists():
-			messagebox.showerror("Script", f"Missing TSP file: {TSP_SOURCE}")
+			self._post(messagebox.showerror, "Script", f"Missing TSP file: {TSP_SOURCE}")
 			return
 		try:
-			script_text = TSP_SOURCE.read_text(encoding="utf-8")
+			script_bytes = _load_tsp_source()
 		except OSError as exc:
-			messagebox.showerror("Script", f"Failed to read TSP file: {exc}")
-			self._log(f"TSP read failed: {exc}")
+			self._post(messagebox.showerror, "Script", f"Failed to read TSP file: {exc}")
+			self._post(self._log, f"TSP read failed: {exc}")
 			return
+		# Delete, upload, save and run in one raw write; write_raw sends the embedded newlines as-is.
+		payload = b"".join((
+			f"pcall(script.delete, '{SCRIPT_NAME}')\nloadscript {SCRIPT_NAME}\n".encode(),
+			script_bytes,
+			f"\nendscript\n{SCRIPT_NAME}.save() {SCRIPT_NAME}()\n".encode(),
+		))
 		try:
-			self.inst.write(f"pcall(script.delete, '{SCRIPT_NAME}')")
-		except pyvisa.VisaIOError:
-			pass
-		try:
-			self.inst.write(f"loadscript {SCRIPT_NAME}")
-			for line in script_text.splitlines():
-				self.inst.write(line)
-			self.inst.write("endscript")
-			self.inst.write(f"{SCRIPT_NAME}.save()")
-			self.inst.write(f"{SCRIPT_NAME}()")
+			self.inst.write_raw(payload)
 			self.script_loaded = True
-			self._log("TSP function loaded.")
-		except pyvisa.VisaIOError as exc:
-			messagebox.showerror("Script", f"Failed to load script: {exc}")
-			self._log(f"Script load failed: {exc}")
+			self._post(self._log, "TSP function loaded.")
+		except Exception as exc:
+			self._post(messagebox.showerror, "Script", f"Failed to load script: {exc}")
+			self._post(self._log, f"Script load failed: {exc}")
 			self.script_loaded = False
 
 	def start_measurement(self) -> None:
@@ -973,7 +1356,7 @@ class ExternalTriggerPanel:
 		)
 
 		self.running = True
-		self.latest_data = []
+		self.latest_data = self._empty_capture()
 		self.status_var.set("Waiting for trigger...")
 		self._log(
 			"Waiting: count=%s, I=%s A, Irange=%s A, Vrange=%s V, NPLC=%s, line=%d (%s edge)"
@@ -989,8 +1372,7 @@ class ExternalTriggerPanel:
 		)
 		self._update_buttons()
 
-		self.worker = threading.Thread(target=self._measurement_worker, args=(command,), daemon=True)
-		self.worker.start()
+		self._io_q.put(lambda: self._measurement_worker(command))
 
 	def cancel_measurement(self) -> None:
 		if not self.running or self.inst is None:
@@ -1006,13 +1388,16 @@ class ExternalTriggerPanel:
 		if inst is None:
 			self._async_finish(error="Instrument disconnected.")
 			return
+		if not self.script_loaded:
+			self._async_finish(error="TSP script is not loaded.")
+			return
 		try:
 			lines = self._execute_command(command)
-		except pyvisa.VisaIOError as exc:
+			data, parse_error = self._parse_measurements(lines)
+		except Exception as exc:
 			self._async_finish(error=str(exc))
 			return
 
-		data, parse_error = self._parse_measurements(lines)
 		if parse_error:
 			self._async_finish(progress=lines, error=parse_error)
 			return
@@ -1022,12 +1407,11 @@ class ExternalTriggerPanel:
 		self,
 		*,
 		progress: list[str] | None = None,
-		data: list[tuple[int, float]] | None = None,
+		data: tuple[np.ndarray, np.ndarray] | None = None,
 		error: str | None = None,
 	) -> None:
 		def finalize() -> None:
 			self.running = False
-			self.worker = None
 			self._update_buttons()
 
 			if progress:
@@ -1039,21 +1423,21 @@ class ExternalTriggerPanel:
 				messagebox.showerror("Run", error)
 				return
 
-			if not data:
+			if data is None or not data[1].size:
 				self.status_var.set("No data returned")
 				self.result_var.set("No samples")
-				self._update_plot([])
+				self._update_plot(self._empty_capture())
 				return
 
 			self.latest_data = data
-			voltages = [v for _, v in data]
+			voltages = data[1]
 			self.status_var.set("Measurement complete")
 			self.result_var.set(
-				f"{len(voltages)} samples | min {min(voltages):.6g} V | max {max(voltages):.6g} V"
+				f"{voltages.size} samples | min {voltages.min():.6g} V | max {voltages.max():.6g} V"
 			)
 			self._update_plot(data)
 
-		self.root.after(0, finalize)
+		self._post(finalize)
 
 	# ------------------------------------------------------------- helpers --
 	def _check_ready(self) -> bool:
@@ -1061,8 +1445,9 @@ class ExternalTriggerPanel:
 			messagebox.showerror("Instrument", "Connect to the instrument first.")
 			return False
 		if not self.script_loaded:
-			self._load_script()
-		return self.script_loaded
+			# Queued ahead of the run, which reports an error if the load fails.
+			self._io_q.put(self._load_script)
+		return True
 
 	def _format_number(self, text: str, *, allow_nil: bool, integer: bool = False) -> str:
 		stripped = text.strip()
@@ -1093,81 +1478,121 @@ class ExternalTriggerPanel:
 		if self.inst is None:
 			raise RuntimeError("Instrument not connected.")
 		inst = self.inst
-		inst.write(command)
-		original_timeout = inst.timeout
-		lines: list[str] = []
-		try:
-			chunk = inst.read().strip()
-			if chunk:
-				lines.append(chunk)
-		except pyvisa.VisaIOError as exc:
-			inst.timeout = original_timeout
-			raise exc
-		try:
-			inst.timeout = min(original_timeout, READ_DRAIN_TIMEOUT_MS)
-			while True:
-				try:
-					chunk = inst.read().strip()
-				except pyvisa.VisaIOError as exc:
-					if exc.error_code == visa_constants.VI_ERROR_TMO:
-						break
-					raise
-				if chunk:
-					lines.append(chunk)
-		finally:
-			inst.timeout = original_timeout
-		return lines
+		inst.write(f"{command} print('{RUN_END_SENTINEL}')")
+		end_line = RUN_END_SENTINEL.encode()
+		payload = bytearray()
+		while True:
+			chunk = inst.read_raw()
+			if chunk.strip() == end_line:
+				break
+			payload += chunk
+		text = payload.decode("ascii", errors="replace")
+		return [line.strip() for line in text.splitlines() if line.strip()]
 
-	def _parse_measurements(self, lines: list[str]) -> tuple[list[tuple[int, float]], str | None]:
-		data: list[tuple[int, float]] = []
-		for line in lines:
-			if not line:
-				continue
-			if line.lower().startswith("error"):
-				return [], line
-			if "reading" in line.lower() and "voltage" in line.lower():
-				continue
-			tokens = line.replace(",", " ").split()
-			if len(tokens) < 2:
-				continue
-			try:
-				idx = int(float(tokens[0]))
-				val = float(tokens[1])
-			except ValueError:
+	@staticmethod
+	def _empty_capture() -> tuple[np.ndarray, np.ndarray]:
+		return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+
+	def _parse_measurements(self, lines: list[str]) -> tuple[tuple[np.ndarray, np.ndarray], str | None]:
+		start: int | None = None
+		for pos, line in enumerate(lines):
+			match = _HEADER_RE.search(line)
+			if match is None:
 				continue
-			data.append((idx, val))
-		return data, None
+			if match.group("error"):
+				return self._empty_capture(), line
+			start = pos + 1
+		if start is None:
+			return self._empty_capture(), None
+		# Everything after the header is "index<ws>value" pairs; parse them in one C pass.
+		body = "\n".join(lines[start:]).translate(_COMMA_TO_SPACE)
+		values = np.fromstring(body, sep=" ") if body else np.empty(0)
+		pairs = values[: values.size - values.size % 2].reshape(-1, 2)
+		return (pairs[:, 0].astype(np.int32), pairs[:, 1].copy()), None
+
+	def _on_draw(self, _event: object) -> None:
+		self._bg = self.canvas.copy_from_bbox(self.ax.bbox)
+		self.ax.draw_artist(self._line)
+
+	def _max_redraw_hz(self) -> int:
+		try:
+			return max(1, self.max_redraw_hz_var.get())
+		except tk.TclError:
+			return DEFAULT_MAX_REDRAW_HZ
+
+	def _update_plot(self, data: tuple[np.ndarray, np.ndarray]) -> None:
+		"""Draw now, or fold into the one draw already due within the redraw-rate limit."""
+		self._pending_data = data
+		if self._plot_pending:
+			return
+		wait = self._last_draw_ts + 1.0 / self._max_redraw_hz() - time.monotonic()
+		if wait <= 0:
+			self._flush_pending_plot()
+			return
+		self._plot_pending = True
+		self.root.after(int(wait * 1000) + 1, self._flush_pending_plot)
 
-	def _update_plot(self, data: list[tuple[int, float]]) -> None:
-		if self.ax is None or self.canvas is None:
+	def _flush_pending_plot(self) -> None:
+		self._plot_pending = False
+		self._last_draw_ts = time.monotonic()
+		self._draw_plot(self._pending_data)
+
+	def _draw_plot(self, data: tuple[np.ndarray, np.ndarray]) -> None:
+		if self.ax is None or self.canvas is None or self._line is None:
 			return
-		self.ax.clear()
-		self.ax.set_xlabel("Sample")
-		self.ax.set_ylabel("Voltage (V)")
-		self.ax.grid(True, linestyle="--", alpha=0.6)
-		if data:
-			x_vals = [idx for idx, _ in data]
-			y_vals = [val for _, val in data]
-			self.ax.plot(x_vals, y_vals, marker="o", markersize=4, linewidth=1.4, color="tab:blue")
-			self.ax.fill_between(x_vals, y_vals, color="tab:blue", alpha=0.2)
-			self.ax.set_xlim(min(x_vals) - 0.5, max(x_vals) + 0.5)
-			self.ax.set_title("Captured samples")
-		else:
-			self.ax.set_title("Awaiting data")
-		self.canvas.draw_idle()
+		x_vals, y_vals = data
+		has_data = bool(y_vals.size)
+		# Skip only exact repeats (e.g. the empty plot after a cancel); a full compare is cheap next to a draw.
+		last = self._last_plot_data
+		if last is not None and np.array_equal(last[0], x_vals) and np.array_equal(last[1], y_vals):
+			return
+		self._last_plot_data = data
+		# Only the plotted copy is reduced; latest_data keeps every sample.
+		self._line.set_data(*_lttb(x_vals.astype(np.float64), y_vals, PLOT_MAX_POINTS))
+
+		# Axes, ticks and title only need re-rendering when the limits or title move.
+		title = "Captured samples" if has_data else "Awaiting data"
+		full_draw = self._bg is None or self.ax.get_title() != title
+		if has_data:
+			xlim = (float(x_vals.min()) - 0.5, float(x_vals.max()) + 0.5)
+			low, high = float(y_vals.min()), float(y_vals.max())
+			y_low, y_high = self.ax.get_ylim()
+			# Refit when the samples leave the view or shrink to under half of it.
+			if self.ax.get_xlim() != xlim or low < y_low or high > y_high or (high - low) * 2 < y_high - y_low:
+				margin = (high - low) * 0.05 or abs(high) * 0.05 or 1e-3
+				self.ax.set_xlim(*xlim)
+				self.ax.set_ylim(low - margin, high + margin)
+				full_draw = True
+		if full_draw:
+			self.ax.set_title(title)
+			self.canvas.draw_idle()
+			return
+		self.canvas.restore_region(self._bg)
+		self.ax.draw_artist(self._line)
+		self.canvas.blit(self.ax.bbox)
 
 	def clear_log(self) -> None:
 		if self.log_widget is None:
 			return
+		self._log_queue.clear()
 		self.log_widget.configure(state=tk.NORMAL)
 		self.log_widget.delete("1.0", tk.END)
 		self.log_widget.configure(state=tk.DISABLED)
 
 	def _log(self, message: str) -> None:
-		if self.log_widget is None:
+		self._log_queue.append(message)
+		if not self._log_flush_pending:
+			self._log_flush_pending = True
+			self.root.after_idle(self._flush_log)
+
+	def _flush_log(self) -> None:
+		self._log_flush_pending = False
+		if self.log_widget is None or not self._log_queue:
 			return
+		batch = "\n".join(self._log_queue)
+		self._log_queue.clear()
 		self.log_widget.configure(state=tk.NORMAL)
-		self.log_widget.insert(tk.END, message + "\n")
+		self.log_widget.insert(tk.END, batch + "\n")
 		self.log_widget.see(tk.END)
 		self.log_widget.configure(state=tk.DISABLED)
 
@@ -1180,9 +1605,12 @@ class ExternalTriggerPanel:
 			self.disconnect()
 		except Exception:
 			pass
-		if self.figure is not None:
+		self._closing = True
+		self._io_q.put(None)
+		self._io_thread.join(timeout=IO_SHUTDOWN_TIMEOUT_S)
+		if self.figure is not None and self._plt is not None:
 			try:
-				plt.close(self.figure)
+				self._plt.close(self.figure)
 			except Exception:
 				pass
 
@@ -1229,10 +1657,6 @@ class CombinedTriggerAndMeasureApp:
 			self.trigger_panel.shutdown()
 		except Exception:
 			pass
-		try:
-			plt.close("all")
-		except Exception:
-			pass
 		self.root.destroy()
 
 	def run(self) -> None:
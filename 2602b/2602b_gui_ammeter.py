@@ -5,9 +5,17 @@ from tkinter import messagebox, scrolledtext, ttk
 
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import numpy as np
 import pyvisa
+from pyvisa import constants as visa_constants
 from pyvisa import errors as visa_errors
 
+# Read slice while waiting for the burst-complete reply, so a cancel is noticed quickly.
+WAIT_SLICE_MS = 250
+# Above this many readings the plot drops its markers; Agg simplifies the line path
+# but still rasterises every marker.
+PLOT_MARKER_LIMIT = 500
+
 # -----------------------------------------------------------------------------
 # THE LUA SCRIPT DEFINITION FOR THE AMMETER FUNCTIONS
 # -----------------------------------------------------------------------------
@@ -55,12 +63,14 @@ loadscript AmmeterFunctions
 
     function GetAmmeterData()
         smua.source.output = smua.OUTPUT_OFF
-        if smua.nvbuffer1.n > 0 then
-            print("DataStart")
-            printbuffer(1, smua.nvbuffer1.n, smua.nvbuffer1)
-            print("DataEnd")
-        else
-            print("Error: Buffer is empty.")
+        -- Count line first, then the readings as one little-endian REAL32 block
+        local n = smua.nvbuffer1.n
+        print(n)
+        if n > 0 then
+            format.data = format.REAL32
+            format.byteorder = format.LITTLEENDIAN
+            printbuffer(1, n, smua.nvbuffer1)
+            format.data = format.ASCII
         end
     end
 endscript
@@ -79,6 +89,7 @@ class KeithleyAmmeterApp:
         self.inst: pyvisa.resources.MessageBasedResource | None = None
         self._bg_thread: threading.Thread | None = None
         self._expected_count: int | None = None
+        self._wait_seq = 0
         self._stop_event = threading.Event()
         self._closing = False
 
@@ -136,6 +147,11 @@ class KeithleyAmmeterApp:
         self.ax.set_xlabel("Sample Index")
         self.ax.set_ylabel("Current (A)")
         self.ax.grid(True)
+        # Force scientific notation on the Y axis. scilimits=(0,0) avoids the confusing
+        # "offset" notation where Matplotlib puts "1e-9" at the top and labels ticks "0, 1, 2".
+        self.ax.ticklabel_format(style="sci", axis="y", scilimits=(0, 0))
+        # One persistent line; each fetch only swaps its data.
+        (self._cur_line,) = self.ax.plot([], [], marker="o", linestyle="-", markersize=4)
 
         self.canvas = FigureCanvasTkAgg(self.figure, master=plot_frame)
         self.canvas.draw()
@@ -162,23 +178,44 @@ class KeithleyAmmeterApp:
         if not resource:
             messagebox.showerror("Connection", "Provide a VISA resource string.")
             return
+        self.connect_btn.configure(state=tk.DISABLED)
+        self.status_var.set(f"Connecting to {resource}...")
+        threading.Thread(target=self._connect_worker, args=(resource,), daemon=True).start()
+
+    def _connect_worker(self, resource: str) -> None:
+        """Open the session and load the script off the Tk thread."""
         try:
             self._ensure_rm()
             assert self.rm is not None
-            self.inst = self.rm.open_resource(resource)
-            self.inst.timeout = 5000
-            self.inst.read_termination = "\n"
-            self.inst.write_termination = "\n"
-            self.inst.clear()
-            self.inst.write(TSP_SCRIPT.strip())
-            self.inst.write("AmmeterFunctions()")
-            self.status_var.set(f"Connected to {resource}. Functions loaded.")
-            self.start_btn.configure(state=tk.NORMAL)
-            self.fetch_btn.configure(state=tk.NORMAL)
-            messagebox.showinfo("Connection", "Connected and script loaded successfully.")
-        except Exception as exc:
-            self.status_var.set("Connection Failed")
-            messagebox.showerror("Connection", str(exc))
+            inst = self.rm.open_resource(resource)
+            inst.timeout = 5000
+            inst.read_termination = "\n"
+            inst.write_termination = "\n"
+            inst.clear()
+            inst.write(TSP_SCRIPT.strip())
+            inst.write("AmmeterFunctions()")
+        except Exception as exc:  # noqa: BLE001
+            self.root.after(0, lambda e=exc: self._connect_failed(e))
+            return
+        self.root.after(0, lambda: self._connect_succeeded(resource, inst))
+
+    def _connect_succeeded(self, resource: str, inst: pyvisa.resources.MessageBasedResource) -> None:
+        if self._closing:
+            inst.close()
+            return
+        self.inst = inst
+        self.connect_btn.configure(state=tk.NORMAL)
+        self.status_var.set(f"Connected to {resource}. Functions loaded.")
+        self.start_btn.configure(state=tk.NORMAL)
+        self.fetch_btn.configure(state=tk.NORMAL)
+        messagebox.showinfo("Connection", "Connected and script loaded successfully.")
+
+    def _connect_failed(self, exc: Exception) -> None:
+        if self._closing:
+            return
+        self.connect_btn.configure(state=tk.NORMAL)
+        self.status_var.set("Connection Failed")
+        messagebox.showerror("Connection", str(exc))
 
     def start_measurement(self) -> None:
         if not self.inst:
@@ -217,76 +254,55 @@ class KeithleyAmmeterApp:
         self._bg_thread = threading.Thread(target=worker, daemon=True)
         self._bg_thread.start()
 
-    def _retrieve_currents(self) -> list[float]:
+    def _retrieve_currents(self) -> np.ndarray:
         assert self.inst is not None
         self._wait_for_buffer_ready()
+        # Last cancel point: once GetAmmeterData() is sent, the binary block must be read
+        # in full or it would be left queued for the next text read.
+        if self._stop_event.is_set():
+            raise RuntimeError("Fetch cancelled.")
         self.inst.write("GetAmmeterData()")
-        raw_content = ""
-        started = False
-        while True:
-            if self._stop_event.is_set():
-                raise RuntimeError("Fetch cancelled.")
-            try:
-                line = self.inst.read()
-            except visa_errors.VisaIOError:
-                break
-            if "DataStart" in line:
-                started = True
-                continue
-            if "DataEnd" in line:
-                break
-            if "Error" in line:
-                raise RuntimeError(line.strip())
-            if started:
-                raw_content += line
-
-        if not raw_content:
-            raise RuntimeError("No data found between tags.")
-
-        currents: list[float] = []
-        for token in raw_content.replace("\n", ",").split(","):
-            if self._stop_event.is_set():
-                raise RuntimeError("Fetch cancelled.")
-            token = token.strip()
-            if not token:
-                continue
-            try:
-                currents.append(float(token))
-            except ValueError:
-                continue
-
-        if not currents:
-            raise RuntimeError("Parsed 0 values from instrument output.")
-        return currents
+        count = int(float(self.inst.read()))
+        if count <= 0:
+            raise RuntimeError("Buffer is empty.")
+        # The count lets pyvisa keep reading past newline bytes inside the binary block.
+        return self.inst.read_binary_values(
+            datatype="f",
+            is_big_endian=False,
+            container=np.ndarray,
+            data_points=count,
+            expect_termination=True,
+        )
 
     def _wait_for_buffer_ready(self) -> None:
         assert self.inst is not None
         expected = self._expected_count or 0
         timeout = max(5.0, expected * 0.01 + 2.0)
-        poll_interval = 0.1
+        # waitcomplete() holds the reply until the burst has finished, replacing the
+        # nvbuffer1.n polling. SOCKET sessions have no SRQ, so completion is a printed
+        # sentinel; the counter keeps a reply from a cancelled wait from matching this one.
+        self._wait_seq += 1
+        sentinel = f"#DONE{self._wait_seq}"
+        self.inst.write(f'waitcomplete() print("{sentinel}")')
+        original_timeout = self.inst.timeout
+        self.inst.timeout = WAIT_SLICE_MS
         deadline = time.perf_counter() + timeout
-        last_count = 0
-        while time.perf_counter() < deadline:
-            if self._stop_event.is_set():
-                raise RuntimeError("Fetch cancelled.")
-            
-            response = self.inst.query("print(smua.nvbuffer1.n)").strip()
-            
-            try:
-                last_count = int(float(response))
-            except ValueError:
-                last_count = 0
-            
-            if expected > 0:
-                if last_count >= expected:
+        try:
+            while time.perf_counter() < deadline:
+                if self._stop_event.is_set():
+                    raise RuntimeError("Fetch cancelled.")
+                try:
+                    line = self.inst.read().strip()
+                except visa_errors.VisaIOError as exc:
+                    if exc.error_code == visa_constants.VI_ERROR_TMO:
+                        continue
+                    raise
+                if line == sentinel:
                     return
-            elif last_count > 0:
-                return
-            time.sleep(poll_interval)
-        
-        raise RuntimeError(
-            f"Buffer still empty (last count={last_count}). Did the measurement complete?"
-        )
+        finally:
+            self.inst.timeout = original_timeout
+
+        raise RuntimeError("Measurement did not complete before the timeout. Did the burst start?")
 
     def _fetch_failed(self, exc: Exception) -> None:
         self.status_var.set("Error fetching data")
@@ -295,7 +311,7 @@ class KeithleyAmmeterApp:
         self._bg_thread = None
         self._restore_controls()
 
-    def _fetch_succeeded(self, currents: list[float]) -> None:
+    def _fetch_succeeded(self, currents: np.ndarray) -> None:
         self._bg_thread = None
         if not self._closing:
             self._update_plot(currents)
@@ -310,27 +326,19 @@ class KeithleyAmmeterApp:
         self.start_btn.configure(state=state)
         self.fetch_btn.configure(state=state)
 
-    def _update_plot(self, currents: list[float]) -> None:
-        self.ax.clear()
-        self.ax.plot(currents, marker="o", linestyle="-", markersize=4)
-        self.ax.set_title(f"Current Measurements (N={len(currents)})")
-        self.ax.set_xlabel("Sample Index")
-        self.ax.set_ylabel("Current (A)")
-        
-        # --- FIX: Force Scientific Notation on Y-Axis ---
-        # scilimits=(0,0) forces scientific notation for all numbers.
-        # This prevents the confusing "offset" notation where Matplotlib
-        # puts "1e-9" at the top of the axis and labels ticks "0, 1, 2".
-        self.ax.ticklabel_format(style='sci', axis='y', scilimits=(0,0))
-        
-        self.ax.grid(True)
-        self.canvas.draw()
+    def _update_plot(self, currents: np.ndarray) -> None:
+        self._cur_line.set_data(np.arange(currents.size), currents)
+        self._cur_line.set_marker("o" if currents.size <= PLOT_MARKER_LIMIT else "None")
+        self.ax.set_title(f"Current Measurements (N={currents.size})")
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.canvas.draw_idle()
 
-    def _update_log(self, currents: list[float]) -> None:
+    def _update_log(self, currents: np.ndarray) -> None:
         self.data_text.configure(state=tk.NORMAL)
         self.data_text.delete("1.0", tk.END)
-        for idx, value in enumerate(currents, start=1):
-            self.data_text.insert(tk.END, f"{idx:03d}: {value:.6e} A\n")
+        text = "\n".join(f"{idx:03d}: {value:.6e} A" for idx, value in enumerate(currents, start=1))
+        self.data_text.insert(tk.END, text + "\n")
         self.data_text.configure(state=tk.DISABLED)
 
     def _on_close(self) -> None:
@@ -5,9 +5,13 @@ from tkinter import messagebox, scrolledtext, ttk
 
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import numpy as np
 import pyvisa
 from pyvisa import errors as visa_errors
 
+# printbuffer separates readings with commas and line breaks; both become whitespace for numpy.
+_CSV_TO_SPACE = str.maketrans({",": " ", "\n": " "})
+
 # -----------------------------------------------------------------------------
 # THE LUA SCRIPT DEFINITION
 # -----------------------------------------------------------------------------
@@ -251,7 +255,7 @@ class KeithleyTriggeredAmmeterApp:
         self._bg_thread = threading.Thread(target=worker, daemon=True)
         self._bg_thread.start()
 
-    def _retrieve_currents(self) -> list[float]:
+    def _retrieve_currents(self) -> np.ndarray:
         assert self.inst is not None
         # Wait for data to exist in buffer (handles timeout if trigger never came)
         self._wait_for_buffer_ready()
@@ -279,19 +283,11 @@ class KeithleyTriggeredAmmeterApp:
         if not raw_content:
             raise RuntimeError("No data found between tags.")
 
-        currents: list[float] = []
-        for token in raw_content.replace("\n", ",").split(","):
-            if self._stop_event.is_set():
-                raise RuntimeError("Fetch cancelled.")
-            token = token.strip()
-            if not token:
-                continue
-            try:
-                currents.append(float(token))
-            except ValueError:
-                continue
+        if self._stop_event.is_set():
+            raise RuntimeError("Fetch cancelled.")
+        currents = np.fromstring(raw_content.translate(_CSV_TO_SPACE), sep=" ", dtype=np.float64)
 
-        if not currents:
+        if not currents.size:
             raise RuntimeError("Parsed 0 values from instrument output.")
         return currents
 
@@ -330,7 +326,7 @@ class KeithleyTriggeredAmmeterApp:
         self._bg_thread = None
         self._restore_controls()
 
-    def _fetch_succeeded(self, currents: list[float]) -> None:
+    def _fetch_succeeded(self, currents: np.ndarray) -> None:
         self._bg_thread = None
         if not self._closing:
             self._update_plot(currents)
@@ -345,7 +341,7 @@ class KeithleyTriggeredAmmeterApp:
         self.start_btn.configure(state=state)
         self.fetch_btn.configure(state=state)
 
-    def _update_plot(self, currents: list[float]) -> None:
+    def _update_plot(self, currents: np.ndarray) -> None:
         self.ax.clear()
         self.ax.plot(currents, marker="o", linestyle="-", markersize=4)
         self.ax.set_title(f"Current Measurements (N={len(currents)})")
@@ -355,7 +351,7 @@ class KeithleyTriggeredAmmeterApp:
         self.ax.grid(True)
         self.canvas.draw()
 
-    def _update_log(self, currents: list[float]) -> None:
+    def _update_log(self, currents: np.ndarray) -> None:
         self.data_text.configure(state=tk.NORMAL)
         self.data_text.delete("1.0", tk.END)
         for idx, value in enumerate(currents, start=1):